@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import argparse
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Local stand-in for ZenQuotes, TheCatAPI and VoiceRSS that replays recorded
+# responses, so the quote -> image -> voice -> video pipeline can be timed
+# without the network. Fixtures live in a folder:
+#   quote.json  - a ZenQuotes /api/random response
+#   cat.jpg     - the image TheCatAPI search points at
+#   voice.mp3   - a VoiceRSS response
+# Record real ones with `python api_fixture_server.py --record` (needs
+# CAT_API_KEY and VOICE_RSS_API_KEY). Missing fixtures fall back to a fixed
+# quote, the local cat_image.jpg and a generated tone.
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_QUOTE = [{"q": "The secret of getting ahead is getting started.", "a": "Mark Twain"}]
+DEFAULT_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cat_image.jpg")
+
+
+def _tone_mp3(seconds=3):
+    """Generates a short MP3 tone with the ffmpeg binary moviepy uses."""
+    from moviepy.config import get_setting
+    command = [get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-f", "lavfi",
+               "-i", f"sine=frequency=440:duration={seconds}", "-ac", "2", "-ar", "44100",
+               "-f", "mp3", "pipe:1"]
+    return subprocess.run(command, check=True, capture_output=True).stdout
+
+
+def load_fixtures(fixture_dir=FIXTURE_DIR):
+    """Reads the recorded responses, filling in defaults for missing ones."""
+    def read(name):
+        path = os.path.join(fixture_dir, name)
+        if os.path.exists(path):
+            with open(path, "rb") as fl_obj:
+                return fl_obj.read()
+        return None
+
+    quote = read("quote.json")
+    image = read("cat.jpg")
+    if image is None:
+        with open(DEFAULT_IMAGE, "rb") as fl_obj:
+            image = fl_obj.read()
+    return {
+        "quote": json.loads(quote) if quote else DEFAULT_QUOTE,
+        "image": image,
+        "voice": read("voice.mp3") or _tone_mp3(),
+    }
+
+
+def record_fixtures(cat_api_key, voice_api_key, fixture_dir=FIXTURE_DIR, text=None):
+    """Calls the real APIs once and stores their responses as fixtures."""
+    os.makedirs(fixture_dir, exist_ok=True)
+    quote = requests.get("https://zenquotes.io/api/random", timeout=10)
+    quote.raise_for_status()
+    with open(os.path.join(fixture_dir, "quote.json"), "w", encoding="utf-8") as fl_obj:
+        json.dump(quote.json(), fl_obj)
+
+    search = requests.get("https://api.thecatapi.com/v1/images/search",
+                          headers={"x-api-key": cat_api_key}, timeout=10)
+    search.raise_for_status()
+    image = requests.get(search.json()[0]["url"], timeout=10)
+    image.raise_for_status()
+    with open(os.path.join(fixture_dir, "cat.jpg"), "wb") as fl_obj:
+        fl_obj.write(image.content)
+
+    params = {"key": voice_api_key, "hl": "en-us", "src": text or f"\"{quote.json()[0]['q']}\"",
+              "r": "0", "c": "mp3", "f": "44khz_16bit_stereo", "b64": "false", "v": "John"}
+    voice = requests.get("https://api.voicerss.org/", params=params, timeout=10)
+    voice.raise_for_status()
+    with open(os.path.join(fixture_dir, "voice.mp3"), "wb") as fl_obj:
+        fl_obj.write(voice.content)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, data, content_type):
+        time.sleep(self.server.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        fixtures = self.server.fixtures
+        path = self.path.split("?", 1)[0]
+        with self.server.lock:
+            self.server.requests[path] = self.server.requests.get(path, 0) + 1
+        if path == "/zenquotes/api/random":
+            self._send(200, json.dumps(fixtures["quote"]).encode("utf-8"), "application/json")
+        elif path == "/thecatapi/v1/images/search":
+            url = f"http://localhost:{self.server.server_address[1]}/images/cat.jpg"
+            self._send(200, json.dumps([{"id": "fixture", "url": url}]).encode("utf-8"), "application/json")
+        elif path == "/images/cat.jpg":
+            self._send(200, fixtures["image"], "image/jpeg")
+        elif path == "/voicerss/":
+            self._send(200, fixtures["voice"], "audio/mpeg")
+        else:
+            self._send(404, b"Not handled by fixture server", "text/plain")
+
+
+def make_fixture_server(port=8090, latency=0.0, fixture_dir=FIXTURE_DIR):
+    """Creates the fixture server without starting it. `latency` is added to every response."""
+    server = ThreadingHTTPServer(("localhost", port), FixtureHandler)
+    server.fixtures = load_fixtures(fixture_dir)
+    server.latency = latency
+    server.requests = {}
+    server.lock = threading.Lock()
+    return server
+
+
+def start_fixture_server(port=8090, latency=0.0, fixture_dir=FIXTURE_DIR):
+    """Starts the server in a background thread and returns it (call .shutdown() to stop)."""
+    server = make_fixture_server(port, latency, fixture_dir)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def endpoints(server):
+    """Base URLs for the three APIs on a running server."""
+    base = f"http://localhost:{server.server_address[1]}"
+    return {
+        "quotes": f"{base}/zenquotes/api/random",
+        "cats": f"{base}/thecatapi/v1/images/search",
+        "voice": f"{base}/voicerss/",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded quote, cat image and voice API responses.")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="Folder holding the recorded responses")
+    parser.add_argument("--record", action="store_true", help="Record fresh fixtures from the real APIs and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(os.environ.get("CAT_API_KEY"), os.environ.get("VOICE_RSS_API_KEY"), args.fixtures)
+        print(f"Fixtures recorded in {args.fixtures}")
+    else:
+        server = make_fixture_server(args.port, args.latency, args.fixtures)
+        print(f"Fixture server listening on http://localhost:{args.port}")
+        server.serve_forever()
@@ -0,0 +1,140 @@
+import os
+import sys
+import shutil
+import logging
+import ntpath
+import functools
+
+# Pre-flight lookup of the fonts, effect files and binaries the scripts use.
+# Call preflight() at the top of a run, before any API request, so a missing
+# font or sound fails in a second instead of after the quote, image and
+# voiceover have been paid for. Every missing asset is reported at once.
+#
+# Names may be bare file names ("BriemHand-Bold.ttf"), relative paths or the
+# old Windows paths ("C:\Windows\Fonts\arial.ttf"); only the file name is
+# used when the path itself doesn't exist. Lookups are cached per process.
+#
+# Search order for files: the path as given, the current folder, the
+# AUTOMATIONS folder, then the folders in $ASSET_PATH. Fonts additionally
+# search the system font folders and fall back to metric-compatible
+# substitutes (Arial -> Liberation Sans). ImageMagick comes from
+# $IMAGEMAGICK_BINARY, then `magick` or `convert` on the PATH.
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FONT_SUBSTITUTES = {
+    "arial.ttf": ["LiberationSans-Regular.ttf", "Arimo-Regular.ttf", "DejaVuSans.ttf"],
+    "arialbd.ttf": ["LiberationSans-Bold.ttf", "Arimo-Bold.ttf", "DejaVuSans-Bold.ttf"],
+}
+IMAGEMAGICK_NAMES = ["magick", "convert"]
+
+
+def _search_dirs():
+    extra = [path for path in os.environ.get("ASSET_PATH", "").split(os.pathsep) if path]
+    return [os.getcwd(), ASSET_DIR] + extra
+
+
+def _font_dirs():
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        return [os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+                os.path.join(os.environ.get("LOCALAPPDATA", home), "Microsoft", "Windows", "Fonts")]
+    if sys.platform == "darwin":
+        return [os.path.join(home, "Library", "Fonts"), "/Library/Fonts", "/System/Library/Fonts"]
+    return [os.path.join(home, ".fonts"), os.path.join(home, ".local", "share", "fonts"),
+            "/usr/local/share/fonts", "/usr/share/fonts"]
+
+
+@functools.lru_cache(maxsize=1)
+def _system_fonts():
+    """Lower-cased file name -> path for every font in the system font folders (scanned once)."""
+    fonts = {}
+    for font_dir in _font_dirs():
+        for root, _, files in os.walk(font_dir):
+            for name in files:
+                fonts.setdefault(name.lower(), os.path.join(root, name))
+    return fonts
+
+
+def _find_in_dirs(name, dirs):
+    if os.path.isfile(name):
+        return os.path.abspath(name)
+    base = ntpath.basename(name)  # handles both / and \ separators
+    for directory in dirs:
+        path = os.path.join(directory, base)
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_file(name):
+    """Absolute path of an asset file such as subclip.ogg; raises FileNotFoundError."""
+    path = _find_in_dirs(name, _search_dirs())
+    if path is None:
+        raise FileNotFoundError(f"Asset not found: {name} (looked in {', '.join(_search_dirs())})")
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_font(name):
+    """Absolute path of a font file, falling back to system fonts and substitutes; raises FileNotFoundError."""
+    path = _find_in_dirs(name, _search_dirs())
+    if path is not None:
+        return path
+    base = ntpath.basename(name).lower()
+    for candidate in [base] + [substitute.lower() for substitute in FONT_SUBSTITUTES.get(base, [])]:
+        if candidate in _system_fonts():
+            if candidate != base:
+                logging.info(f"Font {name} not installed; using {_system_fonts()[candidate]}")
+            return _system_fonts()[candidate]
+    raise FileNotFoundError(f"Font not found: {name} (put it in {ASSET_DIR} or a folder on $ASSET_PATH)")
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_binary(name):
+    """Absolute path of an executable on the PATH (name may also be a path); raises FileNotFoundError."""
+    path = shutil.which(name)
+    if path is None:
+        raise FileNotFoundError(f"Executable not found: {name}")
+    return os.path.abspath(path)
+
+
+@functools.lru_cache(maxsize=1)
+def resolve_imagemagick():
+    """Path of the ImageMagick binary moviepy's TextClip needs; raises FileNotFoundError."""
+    configured = os.environ.get("IMAGEMAGICK_BINARY")
+    for name in [configured] if configured else IMAGEMAGICK_NAMES:
+        try:
+            return resolve_binary(name)
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError("ImageMagick not found: install it or set IMAGEMAGICK_BINARY")
+
+
+def configure_imagemagick():
+    """Points moviepy at the resolved ImageMagick binary (imports moviepy)."""
+    from moviepy.config import change_settings
+    path = resolve_imagemagick()
+    change_settings({"IMAGEMAGICK_BINARY": path})
+    return path
+
+
+def preflight(fonts=(), files=(), binaries=(), imagemagick=False):
+    """
+    Resolves every asset up front and returns {name: path}. Raises a single
+    FileNotFoundError listing everything that is missing.
+    """
+    resolved, missing = {}, []
+    checks = [(name, resolve_font) for name in fonts] + [(name, resolve_file) for name in files]
+    checks += [(name, resolve_binary) for name in binaries]
+    if imagemagick:
+        checks.append(("imagemagick", lambda _: resolve_imagemagick()))
+    for name, resolve in checks:
+        try:
+            resolved[name] = resolve(name)
+        except FileNotFoundError as e:
+            missing.append(str(e))
+    if missing:
+        raise FileNotFoundError("Missing assets:\n  " + "\n  ".join(missing))
+    return resolved
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+import contextlib
+from collections import defaultdict
+
+import quote_media
+from quote_media import apis, styles as card_styles
+from quote_media.video import VIDEO_SIZE
+from video_render import get_profile, profile_size
+from api_fixture_server import FIXTURE_DIR, start_fixture_server, endpoints
+
+# End-to-end timing of the quote_media pipeline (as run by voiced_quote_advanced.py)
+# against the local fixture server, so runs are reproducible and only the latency
+# you ask for is spent on the "network". Seconds are split into stages:
+#   fetch  - quote, cat image and voiceover requests
+#   layout - fitting the quote (adjust_font_size)
+#   raster - the rest of each style function (drawing, effects, saving the PNG)
+#   encode - create_video_with_audio and process_video
+# Stage times are exclusive: layout time is not counted again under raster.
+
+STAGES = ["fetch", "layout", "raster", "encode"]
+STYLE_NAMES = ["minimalist", "retro", "bold", "modern"]
+
+
+class StageTimer:
+    """Accumulates exclusive wall time per stage name; stages may nest."""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self._stack = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self._stack.append(0.0)  # time spent in nested stages
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            self.totals[name] += elapsed - nested
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def wrap(self, func, name):
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return timed
+
+
+def run_pipeline(timer, styles, profile=None, workers=1):
+    """Runs fetch -> style -> video for every style in the current folder, timing each stage."""
+    with timer.stage("fetch"):
+        quote_data = quote_media.fetch_quote()
+        cat_image = quote_media.fetch_cat_asset("fixture", target_size=profile_size(get_profile(profile), VIDEO_SIZE))
+        audio_content = quote_media.fetch_voiceover(f"\"{quote_data['quote']}\"", "fixture") if quote_data else None
+    if not (quote_data and cat_image and audio_content):
+        raise RuntimeError("A fixture request failed; see the log above.")
+    quote_text = f"\"{quote_data['quote']}\""
+    author_text = f"- {quote_data['author']}"
+
+    for style in styles:
+        image_path = f"{style}_output.png"
+        video_path = f"{style}_output_video.mp4"
+        with timer.stage("raster"):
+            quote_media.STYLES[style](cat_image, quote_text, author_text, image_path)
+        with timer.stage("encode"):
+            quote_media.create_video_with_audio(image_path, audio_content, video_path, profile)
+            quote_media.process_video(video_path, video_path.replace(".mp4", "_compatible.mp4"), workers, profile)
+
+
+def benchmark(runs=3, latency=0.05, styles=STYLE_NAMES, profile=None, workers=1, port=8090,
+              fixture_dir=FIXTURE_DIR):
+    """Runs the pipeline `runs` times and returns the per-run stage timings."""
+    server = start_fixture_server(port, latency, fixture_dir)
+    urls = endpoints(server)
+    apis.ZENQUOTES_URL, apis.CAT_API_URL, apis.VOICERSS_URL = urls["quotes"], urls["cats"], urls["voice"]
+    original_layout = card_styles.adjust_font_size
+    original_dir = os.getcwd()
+    results = []
+    try:
+        for _ in range(runs):
+            timer = StageTimer()
+            # The styles look adjust_font_size up at call time, so this times every layout pass
+            card_styles.adjust_font_size = timer.wrap(original_layout, "layout")
+            with tempfile.TemporaryDirectory() as work_dir:
+                # The styles write into the current folder
+                os.chdir(work_dir)
+                try:
+                    with contextlib.redirect_stdout(open(os.devnull, "w")):
+                        start = time.perf_counter()
+                        run_pipeline(timer, styles, profile, workers)
+                        total = time.perf_counter() - start
+                finally:
+                    os.chdir(original_dir)
+            results.append({**{stage: timer.totals[stage] for stage in STAGES}, "total": total})
+    finally:
+        card_styles.adjust_font_size = original_layout
+        server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the quote -> image -> voice -> video pipeline offline.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every fixture response")
+    parser.add_argument("--styles", nargs="+", choices=STYLE_NAMES, default=STYLE_NAMES)
+    parser.add_argument("--profile", default=None, help="Render profile for the encode stage (draft or publish)")
+    parser.add_argument("--workers", type=int, default=1, help="Render workers for process_video")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--json", default=None, help="Also write the per-run timings to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = benchmark(args.runs, args.latency, args.styles, args.profile, args.workers, args.port, args.fixtures)
+    for stage in STAGES + ["total"]:
+        values = [result[stage] for result in results]
+        share = statistics.median(values) / statistics.median([r["total"] for r in results]) * 100
+        print(f"{stage:<8} median {statistics.median(values):8.3f}s  min {min(values):8.3f}s  ({share:5.1f}%)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fl_obj:
+            json.dump(results, fl_obj, indent=2)
@@ -0,0 +1,167 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from quote_media import STYLES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Benchmarks the quote_media card styles against the local cat images at several
+# resolutions and quote lengths, recording time and peak memory per case.
+# Each case runs in a fresh process, so its peak RSS isn't hidden by memory an
+# earlier case already pulled in.
+# Run it from the AUTOMATIONS folder (the styles load their fonts from here):
+#
+#   python bench_styles.py --save-baseline   # record bench_baseline.json
+#   python bench_styles.py                   # compare against it
+#
+# A case counts as a regression when its median time is more than
+# --tolerance slower than the baseline, or its peak RSS more than
+# --memory-tolerance larger; the script then exits with status 1.
+
+IMAGES = ["cat_image.jpg", "cat_image_resized.jpg"]
+RESOLUTIONS = {"native": None, "720p": (1280, 720), "1080p": (1920, 1080)}
+QUOTES = {
+    "short": "\"Stay hungry, stay foolish.\"",
+    "medium": "\"The only way to do great work is to love what you do. If you haven't found it yet, keep looking.\"",
+    "long": "\"Success is not final, failure is not fatal: it is the courage to continue that counts. "
+            "Do not wait to strike till the iron is hot, but make it hot by striking. Believe you can "
+            "and you're halfway there, and remember that every accomplishment starts with the decision to try.\"",
+}
+AUTHOR = "- Unknown"
+BASELINE_PATH = "bench_baseline.json"
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kilobytes on Linux
+
+
+def prepare_input(image_path, resolution, work_dir):
+    """Writes the image at the given resolution (None keeps it as-is) and returns the new path."""
+    image = Image.open(image_path).convert("RGB")
+    if resolution is not None:
+        image = image.resize(resolution)
+    path = os.path.join(work_dir, f"input_{image.width}x{image.height}_{os.path.basename(image_path)}")
+    image.save(path)
+    return path
+
+
+def run_case(style, input_path, quote, output_path, repeats):
+    """
+    Runs one style `repeats` times in this process; returns timings (seconds)
+    and peak memory (bytes). Call it through run_isolated() for a clean RSS peak.
+    """
+    times, python_peaks = [], []
+    for _ in range(repeats):
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            STYLES[style](input_path, quote, AUTHOR, output_path)
+            times.append(time.perf_counter() - start)
+        python_peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "median": statistics.median(times),
+        "min": min(times),
+        "python_peak_bytes": max(python_peaks),
+        "rss_peak_bytes": peak_rss(),
+    }
+
+
+def run_isolated(*args):
+    """run_case() in a fresh process, so ru_maxrss only covers this case."""
+    # A child forked (or exec'd) straight from this process inherits its peak RSS,
+    # so fork from the small forkserver process instead
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_case, *args).result()
+
+
+def run_benchmarks(styles, images, resolutions, quotes, repeats=3):
+    """Runs every combination and returns {case_name: result}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for image_path in images:
+            for resolution_name in resolutions:
+                input_path = prepare_input(image_path, RESOLUTIONS[resolution_name], work_dir)
+                for quote_name in quotes:
+                    for style in styles:
+                        case = f"{style}|{image_path}|{resolution_name}|{quote_name}"
+                        output_path = os.path.join(work_dir, f"{style}_output.png")
+                        result = run_isolated(style, input_path, QUOTES[quote_name], output_path, repeats)
+                        results[case] = result
+                        # Pillow's pixel buffers only show up in RSS, not in tracemalloc
+                        memory = result["rss_peak_bytes"] or result["python_peak_bytes"]
+                        print(f"{case:<50} {result['median'] * 1000:9.1f} ms {memory / 1e6:7.1f} MB")
+    return results
+
+
+def compare(results, baseline, tolerance, memory_tolerance):
+    """
+    Returns (case, metric, baseline, current) for every regression: "median"
+    in seconds, "rss_peak_bytes" in bytes (skipped when either side lacks it).
+    """
+    regressions = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        before = baseline[case]
+        if result["median"] > before["median"] * (1 + tolerance):
+            regressions.append((case, "median", before["median"], result["median"]))
+        if result.get("rss_peak_bytes") and before.get("rss_peak_bytes"):
+            if result["rss_peak_bytes"] > before["rss_peak_bytes"] * (1 + memory_tolerance):
+                regressions.append((case, "rss_peak_bytes", before["rss_peak_bytes"], result["rss_peak_bytes"]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the quote-card image styles.")
+    parser.add_argument("--styles", nargs="+", choices=list(STYLES), default=list(STYLES))
+    parser.add_argument("--images", nargs="+", default=IMAGES)
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument("--quotes", nargs="+", choices=list(QUOTES), default=list(QUOTES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10,
+                        help="Allowed peak RSS growth before flagging (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.styles, args.images, args.resolutions, args.quotes, args.repeats)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fl_obj:
+            json.dump(results, fl_obj, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as fl_obj:
+            regressions = compare(results, json.load(fl_obj), args.tolerance, args.memory_tolerance)
+        for case, metric, before, after in regressions:
+            if metric == "median":
+                print(f"REGRESSION {case}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
+            else:
+                print(f"REGRESSION {case}: peak RSS {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
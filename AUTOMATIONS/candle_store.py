@@ -0,0 +1,168 @@
+import os
+import threading
+
+import numpy as np
+
+# Columnar on-disk store for OHLC candles.
+# Each pair/step lives in its own folder with one raw binary file per column,
+# so a column can be memory-mapped as a contiguous array without reading the rest.
+
+COLUMNS = {
+    "timestamp": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+}
+
+
+def empty_candles():
+    """Returns an empty column dict with the store's dtypes."""
+    return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def to_columns(candles):
+    """
+    Converts candles to a dict of NumPy columns.
+    Accepts a dict of sequences or a list of dicts (e.g. Bitstamp's "ohlc" list,
+    whose values come back as strings).
+    """
+    if isinstance(candles, dict):
+        return {name: np.asarray(candles[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+    if not candles:
+        return empty_candles()
+    columns = {}
+    for name, dtype in COLUMNS.items():
+        values = [row[name] for row in candles]
+        # float() first so "1714000000" and "1714000000.0" both parse for the int column
+        columns[name] = np.array([float(v) for v in values]).astype(dtype)
+    return columns
+
+
+class CandleStore:
+    """Append-only, timestamp-deduplicated candle store for one pair and step."""
+
+    def __init__(self, root, pair, step=60):
+        self.pair = pair
+        self.step = step
+        self.path = os.path.join(root, f"{pair}_{step}")
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def __len__(self):
+        path = self._column_path("timestamp")
+        if not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // np.dtype(COLUMNS["timestamp"]).itemsize
+
+    def _read_column(self, name, count):
+        path = self._column_path(name)
+        if count == 0 or not os.path.exists(path):
+            return np.empty(0, dtype=COLUMNS[name])
+        return np.memmap(path, dtype=COLUMNS[name], mode="r", shape=(count,))
+
+    def _columns(self):
+        # Guard against a column that was only partly written by an interrupted append
+        sizes = []
+        for name, dtype in COLUMNS.items():
+            path = self._column_path(name)
+            sizes.append(os.path.getsize(path) // np.dtype(dtype).itemsize if os.path.exists(path) else 0)
+        count = min(sizes)
+        return {name: self._read_column(name, count) for name in COLUMNS}
+
+    @property
+    def first_timestamp(self):
+        timestamps = self._columns()["timestamp"]
+        return int(timestamps[0]) if len(timestamps) else None
+
+    @property
+    def last_timestamp(self):
+        timestamps = self._columns()["timestamp"]
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def append(self, candles):
+        """
+        Adds candles to the store and returns how many new timestamps were written.
+        Candles newer than the stored tail are appended in place; anything that
+        overlaps or predates the stored range triggers a sorted merge and rewrite.
+        Later values win when a timestamp is already present.
+        """
+        new = to_columns(candles)
+        if len(new["timestamp"]) == 0:
+            return 0
+        order = np.argsort(new["timestamp"], kind="stable")
+        new = {name: column[order] for name, column in new.items()}
+        # Keep the last occurrence of each timestamp within the batch
+        keep = np.append(new["timestamp"][1:] != new["timestamp"][:-1], True)
+        new = {name: column[keep] for name, column in new.items()}
+
+        with self._lock:
+            current = self._columns()
+            count = len(current["timestamp"])
+            if count == 0 or new["timestamp"][0] > current["timestamp"][-1]:
+                del current  # release the memmaps before truncating
+                for name, dtype in COLUMNS.items():
+                    # Drop rows left over from an interrupted append so every column
+                    # continues from the same row
+                    path = self._column_path(name)
+                    if os.path.exists(path):
+                        os.truncate(path, count * np.dtype(dtype).itemsize)
+                    with open(path, "ab") as fl_obj:
+                        fl_obj.write(np.ascontiguousarray(new[name], dtype=dtype).tobytes())
+                return len(new["timestamp"])
+
+            merged = {name: np.concatenate([current[name], new[name]]) for name in COLUMNS}
+            # Stable sort keeps stored rows ahead of new ones, so taking the last
+            # of each run of equal timestamps lets the fresh values win
+            order = np.argsort(merged["timestamp"], kind="stable")
+            merged = {name: column[order] for name, column in merged.items()}
+            keep = np.append(merged["timestamp"][1:] != merged["timestamp"][:-1], True)
+            merged = {name: column[keep] for name, column in merged.items()}
+            added = len(merged["timestamp"]) - count
+            del current  # release the memmaps before replacing the files
+            for name, dtype in COLUMNS.items():
+                tmp_path = self._column_path(name) + ".tmp"
+                merged[name].astype(dtype).tofile(tmp_path)
+            for name in COLUMNS:
+                os.replace(self._column_path(name) + ".tmp", self._column_path(name))
+            return added
+
+    def load(self, start=None, end=None, columns=None):
+        """
+        Returns a dict of read-only column arrays for start <= timestamp <= end.
+        Arrays are memory-mapped slices, so nothing is copied until it is used.
+        """
+        data = self._columns()
+        timestamps = data["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side="right"))
+        names = columns or list(COLUMNS)
+        return {name: data[name][lo:hi] for name in names}
+
+    def missing_ranges(self, start, end):
+        """
+        Returns the (start, end) ranges of start..end with no stored candles:
+        before the first, after the last, and gaps between stored candles.
+        """
+        timestamps = np.asarray(self.load(start, end, columns=["timestamp"])["timestamp"])
+        if len(timestamps) == 0:
+            return [(start, end)]
+        gaps = np.flatnonzero(np.diff(timestamps) > self.step)
+        ranges = [(start, int(timestamps[0]) - self.step)]
+        ranges += [(int(timestamps[i]) + self.step, int(timestamps[i + 1]) - self.step) for i in gaps]
+        ranges.append((int(timestamps[-1]) + self.step, end))
+        return [(lo, hi) for lo, hi in ranges if lo <= hi]
+
+    def to_frame(self, start=None, end=None):
+        """Returns the requested span as a pandas DataFrame indexed by UTC time."""
+        import pandas as pd
+
+        data = self.load(start, end)
+        frame = pd.DataFrame({name: np.asarray(data[name]) for name in COLUMNS if name != "timestamp"})
+        frame.index = pd.to_datetime(np.asarray(data["timestamp"]), unit="s", utc=True)
+        frame.index.name = "timestamp"
+        return frame
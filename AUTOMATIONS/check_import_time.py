@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Import-time budget for the AUTOMATIONS modules that image-only runs load.
+# Each module is imported in a fresh interpreter (so nothing is already
+# cached) and must finish within the budget without pulling in the media
+# stack, which is only meant to load once a video is actually written.
+#
+#   python check_import_time.py              # exits with status 1 on failure
+#   python check_import_time.py --budget 0.5
+
+MODULES = ["tracing", "video_render", "quote_media", "voiced_quote_advanced", "gemini_animated_typography",
+           "bench_styles"]
+HEAVY_MODULES = ["moviepy", "manim", "imageio", "scipy"]
+BUDGET_SECONDS = 1.0
+
+_PROBE = """
+import sys, json, time, importlib
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - start
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[2:]))
+print(json.dumps({"seconds": seconds, "heavy": heavy}))
+"""
+
+
+def measure(module, repeats=3):
+    """Imports `module` in `repeats` fresh interpreters; returns the fastest time and any heavy modules loaded."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", _PROBE, module, *HEAVY_MODULES], cwd=here,
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that image-only imports stay fast and skip the media stack.")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--budget", type=float, default=BUDGET_SECONDS, help="Seconds allowed per import")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh imports per module; the fastest counts")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        result = measure(module, args.repeats)
+        problems = []
+        if result["seconds"] > args.budget:
+            problems.append(f"over the {args.budget:.2f}s budget")
+        if result["heavy"]:
+            problems.append(f"loads {', '.join(result['heavy'])}")
+        failed = failed or bool(problems)
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"{module:<30} {result['seconds'] * 1000:8.1f} ms  {status}")
+    sys.exit(1 if failed else 0)
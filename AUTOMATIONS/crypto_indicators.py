@@ -0,0 +1,164 @@
+import math
+
+import numpy as np
+
+from candle_store import COLUMNS, CandleStore
+
+# Vectorized indicators over candles from candle_store.
+# Rolling windows are computed from cumulative sums, so every indicator is
+# O(n) regardless of window size, and IndicatorEngine only recomputes the
+# tail that changed since the last refresh.
+
+
+def _window_sum(values, window):
+    """Rolling sum over `window` values; the first window-1 entries are NaN."""
+    out = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    cumsum = np.cumsum(values, dtype=np.float64)
+    out[window - 1] = cumsum[window - 1]
+    out[window:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+
+def rolling_mean(values, window):
+    """Simple moving average."""
+    return _window_sum(np.asarray(values, dtype=np.float64), window) / window
+
+
+def rolling_std(values, window):
+    """Rolling population standard deviation."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return np.empty(0)
+    # Shift by the first value to keep the sum-of-squares form numerically sane
+    shifted = values - values[0]
+    mean = _window_sum(shifted, window) / window
+    mean_sq = _window_sum(shifted * shifted, window) / window
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def log_returns(close):
+    """Log returns; the first entry is NaN."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    out[1:] = np.diff(np.log(close))
+    return out
+
+
+def rolling_vwap(high, low, close, volume, window):
+    """Rolling volume-weighted average of the typical price (h + l + c) / 3."""
+    typical = (np.asarray(high, dtype=np.float64) + low + close) / 3.0
+    volume = np.asarray(volume, dtype=np.float64)
+    pv = _window_sum(typical * volume, window)
+    vol = _window_sum(volume, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pv / vol
+
+
+def rolling_volatility(close, window, periods_per_year=None):
+    """
+    Rolling standard deviation of log returns, annualised when
+    periods_per_year is given (e.g. 525600 for minute candles).
+    """
+    returns = log_returns(close)
+    out = np.full(len(returns), np.nan)
+    if len(returns) > 1:
+        out[1:] = rolling_std(returns[1:], window)
+    if periods_per_year:
+        out *= math.sqrt(periods_per_year)
+    return out
+
+
+def compute_indicators(candles, windows=(20, 50), vwap_window=60, volatility_window=60):
+    """
+    Computes every indicator for a dict of candle columns (as returned by
+    CandleStore.load) and returns a dict of arrays aligned with the candles.
+    """
+    close = np.ascontiguousarray(candles["close"], dtype=np.float64)
+    result = {"timestamp": np.array(candles["timestamp"]), "returns": log_returns(close)}
+    for window in windows:
+        result[f"sma_{window}"] = rolling_mean(close, window)
+    result[f"vwap_{vwap_window}"] = rolling_vwap(
+        candles["high"], candles["low"], close, candles["volume"], vwap_window
+    )
+    result[f"volatility_{volatility_window}"] = rolling_volatility(close, volatility_window)
+    return result
+
+
+class IndicatorEngine:
+    """
+    Keeps indicators for one CandleStore up to date.
+    refresh() only recomputes the candles appended since the previous call
+    (plus the look-back needed to fill their windows); a rewrite of older data
+    in the store, or a corrected value in the last known candle, triggers a
+    full recompute.
+    """
+
+    def __init__(self, store, windows=(20, 50), vwap_window=60, volatility_window=60):
+        if not isinstance(store, CandleStore):
+            raise TypeError("store must be a CandleStore")
+        self.store = store
+        self.windows = tuple(windows)
+        self.vwap_window = vwap_window
+        self.volatility_window = volatility_window
+        # The longest window plus one candle for the return that feeds volatility
+        self.lookback = max(self.windows + (vwap_window, volatility_window + 1))
+        self.values = {}
+        self._first_timestamp = None
+        self._last_row = None
+
+    def __len__(self):
+        return len(self.values.get("timestamp", ()))
+
+    def _compute(self, candles):
+        return compute_indicators(candles, self.windows, self.vwap_window, self.volatility_window)
+
+    @staticmethod
+    def _row(candles, index):
+        # The full OHLCV row, so an in-place correction of a candle is noticed too
+        return tuple(candles[name][index].item() for name in COLUMNS)
+
+    def refresh(self):
+        """Brings the indicators in line with the store and returns how many rows were recomputed."""
+        candles = self.store.load()
+        timestamps = candles["timestamp"]
+        count = len(timestamps)
+        known = len(self)
+        if count == 0:
+            self.values = {}
+            self._first_timestamp = self._last_row = None
+            return 0
+
+        stale = (
+            known == 0
+            or count < known
+            or int(timestamps[0]) != self._first_timestamp
+            or self._row(candles, known - 1) != self._last_row
+        )
+        if stale:
+            self.values = self._compute(candles)
+            recomputed = count
+        elif count == known:
+            return 0
+        else:
+            start = max(0, known - self.lookback)
+            tail = self._compute({name: column[start:] for name, column in candles.items()})
+            offset = known - start
+            self.values = {
+                name: np.concatenate([self.values[name], column[offset:]])
+                for name, column in tail.items()
+            }
+            recomputed = count - known
+        self._first_timestamp = int(timestamps[0])
+        self._last_row = self._row(candles, count - 1)
+        return recomputed
+
+    def to_frame(self):
+        """Returns the indicators as a pandas DataFrame indexed by UTC time."""
+        import pandas as pd
+
+        frame = pd.DataFrame({name: column for name, column in self.values.items() if name != "timestamp"})
+        frame.index = pd.to_datetime(self.values.get("timestamp", []), unit="s", utc=True)
+        frame.index.name = "timestamp"
+        return frame
@@ -0,0 +1,114 @@
+import argparse
+import datetime
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from candle_store import CandleStore, to_columns
+
+# Backfills Bitstamp OHLC candles for one or more pairs into a local CandleStore.
+# Only the parts of the requested range that aren't already stored are fetched.
+
+BITSTAMP_OHLC_URL = "https://www.bitstamp.net/api/v2/ohlc/{pair}/"
+PAGE_LIMIT = 1000  # Bitstamp's maximum candles per request
+
+
+def fetch_ohlc_page(pair, start, end, step=60, session=None, retries=3, timeout=10):
+    """
+    Fetches one page (at most PAGE_LIMIT candles) of OHLC data for start..end.
+    Returns the candles as a dict of NumPy columns.
+    """
+    params = {"step": step, "limit": PAGE_LIMIT, "start": start, "end": end}
+    getter = session or requests
+    for attempt in range(retries):
+        try:
+            response = getter.get(BITSTAMP_OHLC_URL.format(pair=pair), params=params, timeout=timeout)
+            response.raise_for_status()
+            return to_columns(response.json().get("data", {}).get("ohlc", []))
+        except requests.exceptions.RequestException as e:
+            if attempt == retries - 1:
+                raise
+            logging.warning(f"Retrying {pair} page {start}-{end} after error: {e}")
+            time.sleep(2 ** attempt)
+
+
+def page_windows(start, end, step=60):
+    """Splits start..end into windows of at most PAGE_LIMIT candles."""
+    span = step * PAGE_LIMIT
+    windows = []
+    cursor = start - start % step
+    while cursor <= end:
+        windows.append((cursor, min(cursor + span - step, end)))
+        cursor += span
+    return windows
+
+
+def last_closed_candle(step=60, now=None):
+    """Timestamp of the newest candle that has fully closed."""
+    now = int(time.time() if now is None else now)
+    return now - now % step - step
+
+
+def backfill(pairs, start, end, root="candles", step=60, max_workers=4):
+    """
+    Backfills every pair for start..end (unix seconds), fetching pages for all
+    pairs concurrently and appending them to each pair's store in chronological
+    order, so each page lands on the stored tail instead of forcing a rewrite.
+    Returns a dict of pair -> number of new candles stored.
+    `end` is capped at the last closed candle: a still-open candle would be
+    stored half-built and never refetched, since stored timestamps are never
+    fetched again. A page that fails leaves a gap the next run fetches.
+    """
+    end = min(end, last_closed_candle(step))
+    stores = {pair: CandleStore(root, pair, step) for pair in pairs}
+    added = {pair: 0 for pair in pairs}
+    jobs = [
+        (pair, lo, hi)
+        for pair, store in stores.items()
+        for missing_start, missing_end in store.missing_ranges(start, end)
+        for lo, hi in page_windows(missing_start, missing_end, step)
+    ]
+    if not jobs:
+        logging.info("Requested range is already stored; nothing to fetch.")
+        return added
+
+    logging.info(f"Fetching {len(jobs)} page(s) for {len(pairs)} pair(s)...")
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_ohlc_page, pair, lo, hi, step, session): (pair, lo, hi)
+            for pair, lo, hi in jobs
+        }
+        # Jobs are in chronological order per pair; collect results in that order
+        for future, (pair, lo, hi) in futures.items():
+            try:
+                added[pair] += stores[pair].append(future.result())
+            except requests.exceptions.RequestException as e:
+                logging.error(f"Failed to fetch {pair} {lo}-{hi}; the next run will retry it: {e}")
+    for pair, count in added.items():
+        logging.info(f"{pair}: {count} new candle(s), {len(stores[pair])} stored")
+    return added
+
+
+def parse_date(value):
+    """Parses YYYY-MM-DD (UTC) or a unix timestamp into unix seconds."""
+    if value.isdigit():
+        return int(value)
+    date = datetime.datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+    return int(date.timestamp())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill Bitstamp OHLC candles into a local store.")
+    parser.add_argument("pairs", nargs="+", help="Currency pairs, e.g. btcusd ethusd")
+    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD) or unix timestamp")
+    parser.add_argument("--end", default=None, help="End date (YYYY-MM-DD) or unix timestamp; defaults to now")
+    parser.add_argument("--step", type=int, default=60, help="Candle size in seconds")
+    parser.add_argument("--root", default="candles", help="Folder holding the candle store")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent requests")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    end = parse_date(args.end) if args.end else last_closed_candle(args.step)
+    backfill(args.pairs, parse_date(args.start), end, args.root, args.step, args.workers)
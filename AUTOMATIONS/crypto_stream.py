@@ -0,0 +1,238 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import websockets
+
+from candle_store import CandleStore
+
+# Live Bitstamp trades -> in-memory OHLC candles -> CandleStore.
+# Consumes the public websocket "live_trades_<pair>" channels instead of
+# polling the REST OHLC endpoint. A replay server that plays back recorded
+# messages is included so the whole path can be exercised offline.
+
+BITSTAMP_WS_URL = "wss://ws.bitstamp.net"
+
+
+class CandleAggregator:
+    """
+    Folds trades into OHLC candles for one pair with constant work per trade.
+    A candle is closed once a trade arrives for a later bucket; closed candles
+    wait in `completed` until they are flushed to the store. The first candle
+    after a (re)connect is dropped rather than completed, since it only holds
+    the trades seen after connecting.
+    """
+
+    def __init__(self, step=60):
+        self.step = step
+        self.current = None
+        self.completed = []
+        self.late_trades = 0
+        self.partial = True  # the current (or next) candle missed trades
+        self.dropped = 0
+
+    def reconnected(self):
+        """Forgets the open candle: trades were missed while disconnected."""
+        if self.current is not None:
+            self.dropped += 1
+        self.current = None
+        self.partial = True
+
+    def add_trade(self, timestamp, price, amount):
+        bucket = int(timestamp) - int(timestamp) % self.step
+        candle = self.current
+        if candle is None or bucket > candle["timestamp"]:
+            if candle is not None and self.partial:
+                self.partial = False
+                self.dropped += 1
+            elif candle is not None:
+                self.completed.append(candle)
+            self.current = {
+                "timestamp": bucket,
+                "open": price,
+                "high": price,
+                "low": price,
+                "close": price,
+                "volume": amount,
+            }
+        elif bucket == candle["timestamp"]:
+            if price > candle["high"]:
+                candle["high"] = price
+            if price < candle["low"]:
+                candle["low"] = price
+            candle["close"] = price
+            candle["volume"] += amount
+        else:
+            # A trade for a candle that's already closed; keep the store append-only
+            self.late_trades += 1
+
+    def drain(self):
+        """Returns and forgets the completed candles."""
+        completed, self.completed = self.completed, []
+        return completed
+
+
+def parse_trade(message):
+    """
+    Returns (pair, timestamp, price, amount) for a Bitstamp trade message,
+    or None for anything else (subscription acks, heartbeats, ...).
+    """
+    if message.get("event") != "trade":
+        return None
+    data = message.get("data", {})
+    pair = message.get("channel", "").replace("live_trades_", "")
+    timestamp = float(data["microtimestamp"]) / 1e6 if "microtimestamp" in data else float(data["timestamp"])
+    return pair, timestamp, float(data["price"]), float(data["amount"])
+
+
+async def stream_candles(pairs, url=BITSTAMP_WS_URL, root="candles", step=60,
+                         duration=None, record_path=None, reconnect=True, reconnect_delay=5):
+    """
+    Subscribes to live trades for every pair, aggregates them into candles and
+    appends closed candles to each pair's CandleStore as soon as they close.
+    Runs until `duration` seconds have passed (forever when None). The first
+    candle after each (re)connect and the candle still open at shutdown are not
+    stored: each only holds part of its minute, and the store would let a later
+    partial bar for the same minute replace it. Backfilling (crypto_ingest.py)
+    fills those minutes once they have closed, as gaps in the stored range.
+    Dropped connections are retried after `reconnect_delay` seconds unless
+    `reconnect` is False. Every raw message is also written to `record_path`
+    (JSON lines) when given, which is the format replay_server() plays back.
+    """
+    aggregators = {pair: CandleAggregator(step) for pair in pairs}
+    stores = {pair: CandleStore(root, pair, step) for pair in pairs}
+    deadline = None if duration is None else time.monotonic() + duration
+    record_file = open(record_path, "a", encoding="utf-8") if record_path else None
+
+    async def flush(pair):
+        candles = aggregators[pair].drain()
+        if candles:
+            added = await asyncio.to_thread(stores[pair].append, candles)
+            logging.info(f"{pair}: flushed {added} candle(s)")
+
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                async with websockets.connect(url) as websocket:
+                    for pair in pairs:
+                        await websocket.send(json.dumps({
+                            "event": "bts:subscribe",
+                            "data": {"channel": f"live_trades_{pair}"},
+                        }))
+                    logging.info(f"Subscribed to {', '.join(pairs)} on {url}")
+                    for aggregator in aggregators.values():
+                        aggregator.reconnected()
+                    while deadline is None or time.monotonic() < deadline:
+                        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                        try:
+                            raw = await asyncio.wait_for(websocket.recv(), timeout)
+                        except asyncio.TimeoutError:
+                            break
+                        if record_file:
+                            record_file.write(raw + "\n")
+                        message = json.loads(raw)
+                        if message.get("event") == "bts:request_reconnect":
+                            logging.info("Server asked us to reconnect.")
+                            break
+                        trade = parse_trade(message)
+                        if trade is None or trade[0] not in aggregators:
+                            continue
+                        pair, timestamp, price, amount = trade
+                        aggregator = aggregators[pair]
+                        aggregator.add_trade(timestamp, price, amount)
+                        if aggregator.completed:
+                            await flush(pair)
+            except websockets.exceptions.ConnectionClosedOK:
+                logging.info("Stream closed by the server.")
+                if not reconnect:
+                    break
+                await asyncio.sleep(reconnect_delay)
+            except (websockets.exceptions.ConnectionClosed, OSError) as e:
+                logging.error(f"Stream disconnected: {e}")
+                if not reconnect:
+                    break
+                await asyncio.sleep(reconnect_delay)
+    finally:
+        for pair, aggregator in aggregators.items():
+            await flush(pair)
+            if aggregator.current is not None:
+                aggregator.dropped += 1
+            if aggregator.dropped:
+                logging.info(f"{pair}: dropped {aggregator.dropped} partial candle(s); backfill them once closed")
+            if aggregator.late_trades:
+                logging.warning(f"{pair}: ignored {aggregator.late_trades} late trade(s)")
+        if record_file:
+            record_file.close()
+    return stores
+
+
+async def replay_server(path, host="localhost", port=8765, speed=None):
+    """
+    Serves messages recorded by stream_candles(record_path=...) to any client,
+    mimicking the Bitstamp websocket. Only channels the client subscribed to are
+    sent. With `speed` set, the original gaps between trades are replayed
+    (divided by speed); otherwise messages are sent back to back.
+    The connection is closed once the recording runs out.
+    """
+    with open(path, encoding="utf-8") as fl_obj:
+        messages = [json.loads(line) for line in fl_obj if line.strip()]
+
+    async def handler(websocket, *args):
+        subscribed = set()
+        # Wait briefly for subscriptions before replaying
+        try:
+            while True:
+                request = json.loads(await asyncio.wait_for(websocket.recv(), 0.2))
+                if request.get("event") == "bts:subscribe":
+                    channel = request["data"]["channel"]
+                    subscribed.add(channel)
+                    await websocket.send(json.dumps({
+                        "event": "bts:subscription_succeeded", "channel": channel, "data": {},
+                    }))
+        except asyncio.TimeoutError:
+            pass
+        previous = None
+        for message in messages:
+            if message.get("channel") not in subscribed:
+                continue
+            if speed and message.get("event") == "trade":
+                timestamp = float(message["data"].get("timestamp", 0))
+                if previous is not None and timestamp > previous:
+                    await asyncio.sleep((timestamp - previous) / speed)
+                previous = timestamp
+            await websocket.send(json.dumps(message))
+        await websocket.close()
+
+    return await websockets.serve(handler, host, port)
+
+
+async def replay(pairs, path, root="candles", step=60, port=8765, speed=None):
+    """Streams a recording through a local replay server into the candle store."""
+    server = await replay_server(path, port=port, speed=speed)
+    try:
+        return await stream_candles(pairs, url=f"ws://localhost:{port}", root=root, step=step,
+                                    reconnect=False)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream Bitstamp trades into local OHLC candles.")
+    parser.add_argument("pairs", nargs="+", help="Currency pairs, e.g. btcusd ethusd")
+    parser.add_argument("--step", type=int, default=60, help="Candle size in seconds")
+    parser.add_argument("--root", default="candles", help="Folder holding the candle store")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--record", default=None, help="Also save raw messages to this JSON lines file")
+    parser.add_argument("--replay", default=None, help="Replay a recorded JSON lines file instead of going live")
+    parser.add_argument("--speed", type=float, default=None, help="Replay speed multiplier (default: as fast as possible)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.replay:
+        asyncio.run(replay(args.pairs, args.replay, args.root, args.step, speed=args.speed))
+    else:
+        asyncio.run(stream_candles(args.pairs, root=args.root, step=args.step,
+                                   duration=args.duration, record_path=args.record))
@@ -1,104 +1,22 @@
-# Configure ImageMagick
-from moviepy.config import change_settings
-change_settings({"IMAGEMAGICK_BINARY": r"C:\Program Files\ImageMagick-7.1.1-Q16-HDRI\magick.exe"})
-
 import requests
-from PIL import Image
 import logging
 from pathlib import Path
 import os
-from io import BytesIO
-import moviepy.editor as mpy
 import argparse
 
+from assets import preflight, configure_imagemagick
+from video_render import RENDER_PROFILES, get_profile, write_options, profile_size, apply_volume
+from tracing import span, traced, write_trace
+from quote_media import fetch_cat_image, fetch_quote, fetch_voiceover
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# --- API Fetch Functions () ---
-
-# Function to fetch a cat image
-def fetch_cat_image(api_key):
-    """Fetches a random cat image from TheCatAPI."""
-    url = "https://api.thecatapi.com/v1/images/search"
-    headers = {"x-api-key": api_key}
-
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-
-        if isinstance(data, list) and data:
-            image_url = data[0].get("url")
-            if image_url:
-                response = requests.get(image_url)
-                response.raise_for_status()
-                img = Image.open(BytesIO(response.content))
-                img = img.convert("RGB")
-                img.save("cat_image.jpg")
-                return "cat_image.jpg"
-            else:
-                logging.error("No 'url' key found in the response data.")
-        else:
-            logging.error("API response is not a valid list or is empty.")
-
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching cat image: {e}")
-    return None
-
-
-# Function to fetch a motivational quote
-def fetch_quote():
-    """
-    Fetches a random motivational quote from ZenQuotes API.
-    """
-    url = "https://zenquotes.io/api/random"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Log the entire data to inspect its structure
-        logging.info(f"Fetched data: {data}")
-
-        if isinstance(data, list) and data:
-            # Check if the list has expected structure
-            quote = data[0].get("q", "No quote found")
-            author = data[0].get("a", "Unknown author")
-            return {"quote": quote, "author": author}
-        else:
-            logging.error("API response is not in expected format.")
-        
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching quote: {e}")
-    return None
-
-
-# Function to fetch voiceover
-def fetch_voiceover(text, api_key, language='en-us'):
-    """Fetches voiceover audio from VoiceRSS API."""
-    url = "https://api.voicerss.org/"
-    params = {
-        'key': api_key,
-        'hl': language,
-        'src': text,
-         "r": "0",       # Speed of speech (0-100)
-        "c": "mp3",     # Audio format
-        "f": "44khz_16bit_stereo",  # Audio quality
-        "b64": "false", # Return raw audio (not base64)
-        "v": "John"     # Male voice
-    }
-
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.content
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching voiceover: {e}")
-    return None
-
 # --- Text Animation Functions ---
 def typewriter_effect(text, font_path, font_size, duration, color="white", bg_color=None):
     """Create a typewriter text animation."""
+    import moviepy.editor as mpy
+
     letters = [text[:i + 1] for i in range(len(text))]
     try:
         text_clips = [
@@ -114,6 +32,8 @@ def typewriter_effect(text, font_path, font_size, duration, color="white", bg_co
 
 def fade_in_text(text, font_path, font_size, duration, color="white", bg_color=None):
     """Create a fade-in text animation."""
+    import moviepy.editor as mpy
+
     try:
         txt_clip = mpy.TextClip(text, font=font_path, fontsize=font_size, color=color, bg_color=bg_color)
     except Exception as e:
@@ -123,7 +43,13 @@ def fade_in_text(text, font_path, font_size, duration, color="white", bg_color=N
     return txt_clip.set_duration(duration).crossfadein(duration / 2)
 
 # --- Video Creation Functions ---
-def animate_text_with_background(cat_image_path, quote, author, output_video, audio_path=r"quote_voice.mp3", font_path=r"BriemHand-ExtraBold.ttf", audio_volume=5.5):
+@traced()
+def animate_text_with_background(cat_image_path, quote, author, output_video, audio_path=r"quote_voice.mp3", font_path=r"BriemHand-ExtraBold.ttf", audio_volume=5.5, profile=None):
+    # moviepy is loaded here rather than at the top so the quote, image and voice
+    # fetches (and --help) don't wait on the media stack
+    import moviepy.editor as mpy
+
+    profile = get_profile(profile)
     try:
         # Validate file paths
         if not cat_image_path or not os.path.exists(cat_image_path):
@@ -139,17 +65,17 @@ def animate_text_with_background(cat_image_path, quote, author, output_video, au
             raise ValueError(f"Invalid output video path: {output_video}")
 
         # Background clip
-        bg_clip = mpy.ImageClip(cat_image_path).set_duration(5).resize((1280, 720))
+        bg_clip = mpy.ImageClip(cat_image_path).set_duration(5).resize(profile_size(profile, (1280, 720)))
 
         # Quote animation
         quote_clip = typewriter_effect(
-            quote, font_path=font_path, font_size=50, duration=4, color="white", bg_color="black")
+            quote, font_path=font_path, font_size=int(50 * profile.scale), duration=4, color="white", bg_color="black")
         if quote_clip is None:
             raise Exception("Error creating quote animation.")
 
         # Author animation
         author_clip = fade_in_text(
-            author, font_path=font_path, font_size=40, duration=2, color="yellow", bg_color="black")
+            author, font_path=font_path, font_size=int(40 * profile.scale), duration=2, color="yellow", bg_color="black")
         if author_clip is None:
             raise Exception("Error creating author animation.")
 
@@ -159,10 +85,11 @@ def animate_text_with_background(cat_image_path, quote, author, output_video, au
         # Add audio if provided
         if audio_path:
             audio = mpy.AudioFileClip(audio_path)
-            final_clip = final_clip.set_audio(audio).volumex(audio_volume)
+            final_clip = apply_volume(final_clip.set_audio(audio), audio_volume, profile)
 
         # Write the video file
-        final_clip.write_videofile(output_video, codec="libx264", fps=24)
+        with span("write_videofile"):
+            final_clip.write_videofile(output_video, codec="libx264", **write_options(profile, fps=24))
         logging.info(f"Video created successfully: {output_video}")
         return True
 
@@ -184,8 +111,18 @@ if __name__ == "__main__":
     parser.add_argument("--output-video", type=str, default="animated_typography_video.mp4", help="Path to output video.")
     parser.add_argument("--audio-path", type=str, default="voiceover.mp3", help="Path to save temp audio.")
     parser.add_argument("--audio-volume", type=float, default=5.5, help="Volume adjustment for audio")
+    parser.add_argument("--profile", choices=list(RENDER_PROFILES), default=None,
+                        help="Render profile: draft for quick previews, publish for full quality (default: $RENDER_PROFILE or publish)")
     args = parser.parse_args()
-    
+
+    # Check the font and ImageMagick (needed by TextClip) before any API call is made
+    try:
+        font_path = preflight(fonts=[args.font_path], imagemagick=True)[args.font_path]
+    except FileNotFoundError as e:
+        logging.error(e)
+        exit(1)
+    configure_imagemagick()
+
     temp_files_to_delete = []
     try:
         # Fetch API keys from environment variables
@@ -230,7 +167,7 @@ if __name__ == "__main__":
         # Create the animated video
         logging.info("Creating the video...")
         video_created = animate_text_with_background(cat_image_path, quote, author, 
-        r"animated_typography_video.mp4", audio_path, args.font_path, args.audio_volume)
+        r"animated_typography_video.mp4", audio_path, font_path, args.audio_volume, args.profile)
         if not video_created:
             logging.error("Video creation failed.")
 
@@ -239,4 +176,5 @@ if __name__ == "__main__":
     except Exception as e:
       logging.error(f"An unexpected error occurred: {e}")
     finally:
-      clean_up_temp_files(temp_files_to_delete)
\ No newline at end of file
+      clean_up_temp_files(temp_files_to_delete)
+      logging.info(f"Trace written to {write_trace('gemini_animated_typography')}")
\ No newline at end of file
@@ -4,60 +4,31 @@ from PIL import Image, ImageDraw, ImageFont
 import os
 import logging
 
+from assets import resolve_font
+from quote_media import fetch_quote, fetch_cat_image_url, ImageAsset
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-def fetch_quote():
-    """
-    Fetches a random motivational quote from ZenQuotes API.
-    """
-    url = "https://zenquotes.io/api/random"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        if data:
-            return {"quote": data[0]["q"], "author": data[0]["a"]}
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching quote: {e}")
-    return None
-
-def fetch_cat_image(api_key):
-    """
-    Fetches a random cat image from TheCatAPI.
-    """
-    url = "https://api.thecatapi.com/v1/images/search"
-    headers = {"x-api-key": api_key}
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        if data:
-            return data[0]["url"]
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching cat image: {e}")
-    return None
-
 def create_image_with_quote(image_url, quote, author, output_path="cat_with_quote.png"):
     """
     Downloads the cat image, adds a quote, and saves the output.
     """
     try:
-        # Download the image
+        # Download the image and decode it in memory, no larger than the output needs
         response = requests.get(image_url)
         response.raise_for_status()
-        with open("cat_image.jpg", "wb") as file:
-            file.write(response.content)
-        
-        # Open and resize the image for better text placement
-        img = Image.open("cat_image.jpg").convert("RGBA")
+        asset = ImageAsset(response.content, target_size=(1080, 1920))
+
+        # Resize the image for better text placement
+        img = asset.image.convert("RGBA")
         img = img.resize((1080, 1920))  # Resize for consistent output
         draw = ImageDraw.Draw(img)
         
         # Load font
-        font_path = "arial.ttf"  # Update path if necessary
+        font_path = "arial.ttf"
         try:
-            font = ImageFont.truetype(font_path, size=24)
+            font = ImageFont.truetype(resolve_font(font_path), size=24)
         except IOError:
             logging.error(f"Font file not found at {font_path}. Using default font.")
             font = ImageFont.load_default()
@@ -119,7 +90,7 @@ if not all([consumer_key, consumer_secret, access_token, access_token_secret, ca
 else:
     # Fetch the quote and cat image
     quote_data = fetch_quote()
-    cat_image_url = fetch_cat_image(cat_api_key)
+    cat_image_url = fetch_cat_image_url(cat_api_key)
 
     if quote_data and cat_image_url:
         quote = quote_data["quote"]
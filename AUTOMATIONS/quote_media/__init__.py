@@ -0,0 +1,15 @@
+"""
+Shared building blocks for the quote-card scripts in AUTOMATIONS: API
+clients, text fitting, image helpers, the four card styles and the video
+writers. Import from the package, e.g. `from quote_media import fetch_quote`.
+"""
+
+from quote_media.image_asset import ImageAsset, open_image
+from quote_media.apis import fetch_quote, fetch_cat_image, fetch_cat_asset, fetch_cat_image_url, fetch_voiceover
+from quote_media.text import wrap_text, adjust_font_size, load_font
+from quote_media.imaging import calculate_brightness, get_overlay_color, apply_sepia
+from quote_media.layers import solid_layer, rings_layer
+from quote_media.contrast import region_stats, choose_overlay, overlay_for_region, ContrastTracker
+from quote_media.styles import minimalist_style, retro_style, bold_style, modern_abstract_style, STYLES, STYLE_FONTS
+from quote_media.video import create_video_with_audio, process_video, apply_style
+
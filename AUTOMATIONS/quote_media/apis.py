@@ -0,0 +1,110 @@
+import logging
+
+import requests
+
+from tracing import traced
+from quote_media.image_asset import ImageAsset
+
+# ZenQuotes, TheCatAPI and VoiceRSS clients shared by the quote scripts.
+# One Session is reused so repeated calls keep their HTTPS connections open.
+
+ZENQUOTES_URL = "https://zenquotes.io/api/random"
+CAT_API_URL = "https://api.thecatapi.com/v1/images/search"
+VOICERSS_URL = "https://api.voicerss.org/"
+TIMEOUT = 10
+
+session = requests.Session()
+
+
+@traced()
+def fetch_quote(default=None):
+    """
+    Fetches a random motivational quote from ZenQuotes API.
+    Returns {"quote": ..., "author": ...}, or `default` when the request fails.
+    """
+    try:
+        response = session.get(ZENQUOTES_URL, timeout=TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        logging.info(f"Fetched data: {data}")
+        if isinstance(data, list) and data:
+            return {"quote": data[0].get("q", "No quote found"), "author": data[0].get("a", "Unknown author")}
+        logging.error("API response is not in expected format.")
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching quote: {e}")
+    return default
+
+
+def fetch_cat_image_url(api_key):
+    """Returns the URL of a random cat image from TheCatAPI, or None."""
+    try:
+        response = session.get(CAT_API_URL, headers={"x-api-key": api_key}, timeout=TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, list) and data:
+            if "url" in data[0]:
+                return data[0]["url"]
+            logging.error("No 'url' key found in the response data.")
+        else:
+            logging.error("API response is not a valid list or is empty.")
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching cat image: {e}")
+    return None
+
+
+@traced()
+def fetch_cat_asset(api_key, target_size=None):
+    """
+    Fetches a random cat image from TheCatAPI as an in-memory ImageAsset
+    (nothing is written to disk). Returns None on failure.
+    """
+    image_url = fetch_cat_image_url(api_key)
+    if image_url is None:
+        return None
+    try:
+        response = session.get(image_url, timeout=TIMEOUT)
+        response.raise_for_status()
+        return ImageAsset(response.content, target_size)
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching cat image: {e}")
+    return None
+
+
+@traced()
+def fetch_cat_image(api_key, path="cat_image.jpg"):
+    """
+    Fetches a random cat image from TheCatAPI and saves it locally as RGB.
+    Returns the saved path, or None. For scripts that need a file (Manim, moviepy).
+    """
+    asset = fetch_cat_asset(api_key)
+    return asset.save(path) if asset else None
+
+
+@traced()
+def fetch_voiceover(text, api_key, language="en-us", voice="John", path=None):
+    """
+    Fetches a voiceover (text-to-speech) from VoiceRSS API.
+    Returns the MP3 bytes, or writes them to `path` and returns the path.
+    Returns None on failure.
+    """
+    params = {
+        "key": api_key,
+        "hl": language,
+        "src": text,
+        "r": "0",
+        "c": "mp3",
+        "f": "44khz_16bit_stereo",
+        "b64": "false",
+        "v": voice,
+    }
+    try:
+        response = session.get(VOICERSS_URL, params=params, timeout=TIMEOUT)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching voiceover: {e}")
+        return None
+    if path is None:
+        return response.content
+    with open(path, "wb") as fl_obj:
+        fl_obj.write(response.content)
+    return path
@@ -0,0 +1,138 @@
+from dataclasses import dataclass, astuple
+
+import numpy as np
+from PIL import Image
+
+# Picks the overlay behind the quote text from the part of the image the text
+# actually covers, instead of the whole image's mean brightness.
+#
+# Statistics are computed on a downsampled copy of the text band (at most
+# SAMPLE_SIDE pixels per side), so the cost doesn't grow with the image and
+# is small enough to run on every frame of a video background. The overlay
+# is black or white, whichever reaches the target WCAG contrast ratio
+# against the text with the lower opacity, checked against the band's
+# brightest/darkest pixels (percentiles) rather than its mean.
+
+SAMPLE_SIDE = 64
+TARGET_CONTRAST = 4.5   # WCAG AA for normal text
+MIN_OPACITY = 0.25
+MAX_OPACITY = 0.85
+LUMA_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+@dataclass(frozen=True)
+class LuminanceStats:
+    mean: float  # gamma-encoded luma, 0-1
+    std: float
+    low: float   # 5th percentile
+    high: float  # 95th percentile
+
+
+@dataclass(frozen=True)
+class Overlay:
+    color: tuple      # RGBA for Image.new
+    text_fill: str    # "black" or "white"
+    opacity: float    # 0-1
+    contrast: float   # worst-case contrast ratio after the overlay
+
+
+def to_linear(value):
+    """sRGB-encoded value(s) in 0-1 to linear light."""
+    value = np.asarray(value, dtype=np.float32)
+    return np.where(value <= 0.04045, value / 12.92, ((value + 0.055) / 1.055) ** 2.4)
+
+
+def to_encoded(value):
+    """Linear light in 0-1 to sRGB-encoded value(s)."""
+    value = np.clip(np.asarray(value, dtype=np.float32), 0, 1)
+    return np.where(value <= 0.0031308, value * 12.92, 1.055 * value ** (1 / 2.4) - 0.055)
+
+
+def contrast_ratio(luminance_a, luminance_b):
+    """WCAG contrast ratio between two linear luminances."""
+    lighter, darker = max(luminance_a, luminance_b), min(luminance_a, luminance_b)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def _sample(image, box):
+    """Downsampled RGB pixels of `box` (left, top, right, bottom) as a float array in 0-1."""
+    if isinstance(image, Image.Image):
+        region = image.crop(box) if box else image
+        factor = max(1, max(region.size) // SAMPLE_SIDE)
+        if factor > 1:
+            region = region.reduce(factor)
+        pixels = np.asarray(region.convert("RGB"))
+    else:
+        # A video frame (H x W x 3 uint8): stride instead of resizing
+        frame = np.asarray(image)
+        if box:
+            left, top, right, bottom = box
+            frame = frame[top:bottom, left:right]
+        step = max(1, max(frame.shape[:2]) // SAMPLE_SIDE)
+        pixels = frame[::step, ::step, :3]
+    return pixels.astype(np.float32) / 255.0
+
+
+def region_stats(image, box=None):
+    """Luma statistics of a PIL image or a NumPy frame, optionally limited to `box`."""
+    luma = _sample(image, box) @ LUMA_WEIGHTS
+    low, high = np.percentile(luma, [5, 95])
+    return LuminanceStats(float(luma.mean()), float(luma.std()), float(low), float(high))
+
+
+def _required_opacity(stats, dark, target):
+    """Smallest overlay opacity giving `target` contrast against the band's worst pixels."""
+    if dark:
+        # White text over black: the brightest pixels limit the contrast
+        limit = float(to_encoded(1.05 / target - 0.05))
+        worst = stats.high
+        return 0.0 if worst <= limit else 1 - limit / worst
+    # Black text over white: the darkest pixels limit the contrast
+    limit = float(to_encoded(0.05 * target - 0.05))
+    worst = stats.low
+    return 0.0 if worst >= limit else (limit - worst) / (1 - worst)
+
+
+def choose_overlay(stats, target=TARGET_CONTRAST, min_opacity=MIN_OPACITY, max_opacity=MAX_OPACITY):
+    """Overlay colour, opacity and text colour for a text band with these statistics."""
+    candidates = []
+    for dark in (True, False):
+        opacity = min(max(_required_opacity(stats, dark, target), min_opacity), max_opacity)
+        if dark:
+            worst = float(to_linear(stats.high * (1 - opacity)))
+            contrast = contrast_ratio(1.0, worst)
+        else:
+            worst = float(to_linear(stats.low * (1 - opacity) + opacity))
+            contrast = contrast_ratio(worst, 0.0)
+        # Prefer whichever reaches the target; among those, the lighter touch
+        candidates.append((contrast < target, opacity, -contrast, dark, contrast))
+    _, opacity, _, dark, contrast = min(candidates)
+    value = 0 if dark else 255
+    return Overlay((value, value, value, round(opacity * 255)), "white" if dark else "black", opacity, contrast)
+
+
+def overlay_for_region(image, box=None, **options):
+    """choose_overlay() for the given region of an image or frame."""
+    return choose_overlay(region_stats(image, box), **options)
+
+
+class ContrastTracker:
+    """
+    Per-frame overlay choice for video backgrounds. Statistics are smoothed
+    across frames so the overlay doesn't flicker with every cut or highlight.
+    """
+
+    def __init__(self, box=None, smoothing=0.2, **options):
+        self.box = box
+        self.smoothing = smoothing  # weight of the newest frame
+        self.options = options
+        self.stats = None
+
+    def update(self, frame):
+        stats = region_stats(frame, self.box)
+        if self.stats is not None:
+            keep = 1 - self.smoothing
+            stats = LuminanceStats(*(keep * old + self.smoothing * new
+                                     for old, new in zip(astuple(self.stats), astuple(stats))))
+        self.stats = stats
+        return choose_overlay(stats, **self.options)
@@ -0,0 +1,70 @@
+import os
+from io import BytesIO
+
+from PIL import Image
+
+# A fetched image that is decoded once and kept in memory. The styles take
+# an ImageAsset wherever they take an image path and draw on a copy of the
+# decoded bitmap, so one run decodes the download once instead of saving
+# it as cat_image.jpg and re-opening it for every style.
+#
+# target_size enables JPEG draft decoding: the decoder scales down by 1/2,
+# 1/4 or 1/8 while decoding, as long as the result stays at least that size.
+# Nothing is written to disk unless save() is called.
+
+
+class ImageAsset:
+    def __init__(self, data, target_size=None):
+        self.data = data
+        self.target_size = target_size
+        self.path = None
+        self.format = self.mode = self.original_size = None
+        self._image = None
+
+    @classmethod
+    def from_path(cls, path, target_size=None):
+        with open(path, "rb") as fl_obj:
+            asset = cls(fl_obj.read(), target_size)
+        asset.path = path
+        return asset
+
+    @property
+    def image(self):
+        """The decoded RGB bitmap (decoded on first use). Don't draw on it; use copy()."""
+        if self._image is None:
+            image = Image.open(BytesIO(self.data))
+            self.format, self.mode, self.original_size = image.format, image.mode, image.size
+            if self.target_size:
+                image.draft("RGB", self.target_size)
+            self._image = image.convert("RGB")
+        return self._image
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def copy(self):
+        """A fresh copy of the bitmap to draw on."""
+        return self.image.copy()
+
+    def save(self, path="cat_image.jpg"):
+        """
+        Writes the image to `path` and returns it. An RGB JPEG saved as .jpg
+        at its original size is written byte for byte, without re-encoding.
+        """
+        image = self.image
+        as_downloaded = self.format == "JPEG" and self.mode == "RGB" and image.size == self.original_size
+        if as_downloaded and os.path.splitext(path)[1].lower() in (".jpg", ".jpeg"):
+            with open(path, "wb") as fl_obj:
+                fl_obj.write(self.data)
+        else:
+            image.save(path)
+        self.path = path
+        return path
+
+
+def open_image(source):
+    """A drawable RGB copy of an ImageAsset, or the image at a path."""
+    if isinstance(source, ImageAsset):
+        return source.copy()
+    return Image.open(source)
@@ -0,0 +1,30 @@
+from PIL import ImageOps, ImageStat
+
+# Whole-image operations run inside Pillow's C code rather than per pixel in Python.
+
+# Classic sepia weights, as a Pillow RGB -> RGB conversion matrix
+SEPIA_MATRIX = (
+    0.393, 0.769, 0.189, 0,
+    0.349, 0.686, 0.168, 0,
+    0.272, 0.534, 0.131, 0,
+)
+
+
+def calculate_brightness(image):
+    """Average brightness (0-255) of the image's grayscale version."""
+    return ImageStat.Stat(ImageOps.grayscale(image)).mean[0]
+
+
+def get_overlay_color(brightness, opacity=128):
+    """
+    Returns a light overlay color if the image is dark,
+    and a dark overlay color if the image is light.
+    """
+    if brightness < 128:
+        return (255, 255, 255, opacity)
+    return (0, 0, 0, opacity)
+
+
+def apply_sepia(image):
+    """Returns a sepia-toned RGB copy of the image."""
+    return image.convert("RGB").convert("RGB", SEPIA_MATRIX)
@@ -0,0 +1,41 @@
+import functools
+
+from PIL import Image, ImageDraw
+
+# Pre-rendered overlay and decoration layers, shared across renders.
+# A batch of cards with the same dimensions draws each layer once; later
+# cards reuse it. Layers are keyed by everything that changes their pixels
+# (size, colour including opacity, and the decoration's own parameters).
+#
+# Cached layers are shared: paste or composite them, never draw on them.
+
+CACHE_SIZE = 32  # layers per kind; a 1080p text band is ~2 MB
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def solid_layer(size, color):
+    """Uniform RGBA layer of `size` in `color` (an RGBA tuple; alpha is the opacity)."""
+    return Image.new("RGBA", size, color)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def rings_layer(radius, step=5, color="orange", width=3):
+    """
+    Concentric circle outlines (radius, radius - step, ...) on a transparent
+    square layer centred on the middle pixel.
+    """
+    layer = Image.new("RGBA", (2 * radius + 1, 2 * radius + 1), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    for i in range(radius, 0, -step):
+        draw.ellipse([radius - i, radius - i, radius + i, radius + i], outline=color, width=width)
+    return layer
+
+
+def cache_info():
+    """Hit/miss counts per layer kind."""
+    return {"solid": solid_layer.cache_info(), "rings": rings_layer.cache_info()}
+
+
+def clear_cache():
+    solid_layer.cache_clear()
+    rings_layer.cache_clear()
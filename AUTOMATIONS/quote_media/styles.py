@@ -0,0 +1,122 @@
+from PIL import ImageDraw
+
+from tracing import traced
+from quote_media.text import adjust_font_size, text_size, LINE_SPACING
+from quote_media.imaging import apply_sepia
+from quote_media.contrast import overlay_for_region
+from quote_media.layers import solid_layer, rings_layer
+from quote_media.image_asset import open_image
+
+# The four quote-card styles. Each draws the quote and its author onto the
+# image at image_path (a path or an in-memory ImageAsset) and saves the
+# result to output_path. Fonts are looked up with assets.resolve_font, so the
+# scripts can run from any folder.
+
+MINIMALIST_FONT = "BriemHand-ExtraBold.ttf"
+RETRO_FONT = "BriemHand-Bold.ttf"
+BOLD_FONT = "BriemHand-Black.ttf"
+MODERN_FONT = "Allura-Regular.ttf"
+# Font each style needs, for assets.preflight()
+STYLE_FONTS = {
+    "minimalist": MINIMALIST_FONT,
+    "retro": RETRO_FONT,
+    "bold": BOLD_FONT,
+    "modern": MODERN_FONT,
+}
+
+
+def _text_block_height(lines, font, author, author_font, padding):
+    line_height = text_size("A", font)[1]
+    quote_height = len(lines) * line_height + (len(lines) - 1) * LINE_SPACING
+    return line_height, quote_height + text_size(author, author_font)[1] + padding * 2
+
+
+def _draw_centered(draw, image, lines, font, author, author_font, y_offset, line_height, gap, fill):
+    for line in lines:
+        draw.text(((image.width - text_size(line, font)[0]) // 2, y_offset), line, font=font, fill=fill)
+        y_offset += line_height + gap
+    draw.text(((image.width - text_size(author, author_font)[0]) // 2, y_offset), author, font=author_font, fill=fill)
+
+
+def _overlay_card(image, quote, author, font_path, output_path):
+    """Shared layout of the minimalist and retro styles: text on a contrasting band at the bottom."""
+    font, author_font, lines = adjust_font_size(image, quote, author, image.width - 40, font_path,
+                                                max_text_height_ratio=0.4)
+    padding = 30
+    line_height, total_text_height = _text_block_height(lines, font, author, author_font, padding)
+
+    # Colour and opacity come from the band the text covers, not the whole image
+    band_top = image.height - total_text_height
+    choice = overlay_for_region(image, (0, band_top, image.width, image.height))
+    overlay = solid_layer((image.width, total_text_height), choice.color)
+    image.paste(overlay, (0, band_top), overlay)
+
+    _draw_centered(ImageDraw.Draw(image), image, lines, font, author, author_font,
+                   band_top + padding, line_height, LINE_SPACING, choice.text_fill)
+    image.save(output_path)
+
+
+@traced()
+def minimalist_style(image_path, quote, author, output_path):
+    _overlay_card(open_image(image_path), quote, author, MINIMALIST_FONT, output_path)
+    print(f"Minimalist style saved as {output_path}")
+
+
+@traced()
+def retro_style(image_path, quote, author, output_path):
+    _overlay_card(apply_sepia(open_image(image_path)), quote, author, RETRO_FONT, output_path)
+    print(f"Retro style saved as {output_path}")
+
+
+@traced()
+def bold_style(image_path, quote, author, output_path):
+    image = open_image(image_path)
+    draw = ImageDraw.Draw(image)
+    font, author_font, lines = adjust_font_size(image, quote, author, image.width - 40, BOLD_FONT,
+                                                max_text_height_ratio=0.4)
+    padding = 40
+    line_height = text_size("A", font)[1]
+    quote_height = len(lines) * line_height + (len(lines) - 1) * LINE_SPACING
+    author_height = text_size(author, author_font)[1]
+
+    # Each line sits on its own black bar
+    y_offset = image.height - padding - quote_height - author_height - 10
+    for line in lines:
+        text_width, text_height = text_size(line, font)
+        draw.rectangle([(50, y_offset), (image.width - 50, y_offset + text_height + 10)], fill="black")
+        draw.text(((image.width - text_width) // 2, y_offset), line, font=font, fill="red")
+        y_offset += text_height + 20
+    draw.text(((image.width - text_size(author, author_font)[0]) // 2, y_offset), author, font=author_font, fill="red")
+
+    image.save(output_path)
+    print(f"Bold style saved as {output_path}")
+
+
+@traced()
+def modern_abstract_style(image_path, quote, author, output_path):
+    image = open_image(image_path)
+    draw = ImageDraw.Draw(image)
+    font, author_font, lines = adjust_font_size(image, quote, author, image.width - 40, MODERN_FONT,
+                                                max_text_height_ratio=0.4)
+
+    # Concentric orange circles in the top-right corner, drawn once and reused
+    radius = 100
+    center_x, center_y = image.width - radius - 10, 10
+    rings = rings_layer(radius, 5, "orange", 3)
+    image.paste(rings, (center_x - radius, center_y - radius), rings)
+
+    padding = 30
+    line_height, total_text_height = _text_block_height(lines, font, author, author_font, padding)
+    _draw_centered(draw, image, lines, font, author, author_font, image.height - total_text_height - 10,
+                   line_height, LINE_SPACING, "white")
+
+    image.save(output_path)
+    print(f"Modern abstract style saved as {output_path}")
+
+
+STYLES = {
+    "minimalist": minimalist_style,
+    "retro": retro_style,
+    "bold": bold_style,
+    "modern": modern_abstract_style,
+}
@@ -0,0 +1,77 @@
+import functools
+
+from PIL import Image, ImageDraw, ImageFont
+
+from assets import resolve_font
+
+# Text wrapping and font fitting for the quote cards.
+
+LINE_SPACING = 5
+BLOCK_PADDING = 20
+
+_measure = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+@functools.lru_cache(maxsize=256)
+def load_font(font_path, size):
+    """Loads a TrueType font (located via assets.resolve_font); cached, since fitting tries many sizes."""
+    return ImageFont.truetype(resolve_font(font_path), size=size)
+
+
+def text_size(text, font):
+    """(width, height) of the text's bounding box."""
+    left, top, right, bottom = _measure.textbbox((0, 0), text, font=font)
+    return right - left, bottom - top
+
+
+def wrap_text(text, max_width, font, draw=None):
+    """Wrap text word by word so no line is wider than max_width pixels."""
+    lines = []
+    current_line = ""
+    for word in text.split():
+        test_line = f"{current_line} {word}" if current_line else word
+        if current_line and font.getlength(test_line) > max_width:
+            lines.append(current_line)
+            current_line = word
+        else:
+            current_line = test_line
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def _layout(quote, author, font_path, size, max_width, author_size_offset):
+    font = load_font(font_path, size)
+    author_font = load_font(font_path, max(1, size - author_size_offset))
+    lines = wrap_text(quote, max_width, font)
+    line_height = text_size("A", font)[1]
+    quote_height = len(lines) * line_height + (len(lines) - 1) * LINE_SPACING
+    height = quote_height + text_size(author, author_font)[1] + BLOCK_PADDING * 2
+    width = max((text_size(line, font)[0] for line in lines), default=0)
+    return font, author_font, lines, width, height
+
+
+def adjust_font_size(image, quote, author, max_width, font_path, max_text_height_ratio=0.4, author_size_offset=10):
+    """
+    Picks the largest font size (up to 10% of the image height) at which the
+    wrapped quote and the author line fit within max_width and within
+    max_text_height_ratio of the image height. A smaller font never needs more
+    room, so the size is found by bisection instead of trying every size.
+
+    Returns the quote font, the author font and the wrapped quote lines.
+    """
+    max_text_height = image.height * max_text_height_ratio
+    low, high = 11, int(image.height * 0.1)
+    best = None
+    while low <= high:
+        size = (low + high) // 2
+        layout = _layout(quote, author, font_path, size, max_width, author_size_offset)
+        if layout[3] <= max_width and layout[4] <= max_text_height:
+            best = layout
+            low = size + 1
+        else:
+            high = size - 1
+    if best is None:
+        best = _layout(quote, author, font_path, max(1, min(10, int(image.height * 0.1))), max_width,
+                       author_size_offset)
+    return best[0], best[1], best[2]
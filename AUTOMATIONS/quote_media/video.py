@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+from tracing import span, traced
+from video_render import render_segmented, get_profile, write_options, profile_size, apply_volume
+from quote_media.styles import STYLES
+
+# Turning quote cards into videos: a still image with the voiceover, and the
+# re-encode to a fixed size that the post-processing step does.
+# moviepy.editor takes a while to import, so it is only loaded once a video is
+# actually written; image-only runs never touch it.
+
+VIDEO_SIZE = (1280, 720)
+FPS = 24
+CODEC = "libx264"
+
+
+@traced()
+def create_video_with_audio(image_path, audio_content, output_video="output_video.mp4", profile=None, duration=5):
+    """
+    Creates a video from an image and audio content (MP3 bytes).
+    """
+    import moviepy.editor as mpy
+
+    profile = get_profile(profile)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio_file:
+        temp_audio_file.write(audio_content)
+        temp_audio_path = temp_audio_file.name
+    try:
+        audio_clip = mpy.AudioFileClip(temp_audio_path)
+        image_clip = mpy.ImageClip(image_path, duration=duration)
+        if profile.scale != 1:
+            image_clip = image_clip.resize(newsize=profile_size(profile, image_clip.size))
+        video_clip = image_clip.set_audio(audio_clip)
+        with span("write_videofile"):
+            video_clip.write_videofile(output_video, codec=CODEC,
+                                       **write_options(profile, fps=FPS, ffmpeg_params=["-loglevel", "error"]))
+        audio_clip.close()
+    finally:
+        os.unlink(temp_audio_path)
+    print(f"Video created: {output_video}")
+
+
+def resized_clip(input_video_path, size, volume, profile):
+    """Builds the resized, louder clip; top-level so render workers can rebuild it."""
+    import moviepy.editor as mpy
+
+    video = mpy.VideoFileClip(input_video_path)
+    return apply_volume(video.resize(newsize=size), volume, profile)
+
+
+@traced()
+def process_video(input_video_path, output_video_path, workers=1, profile=None, size=VIDEO_SIZE, volume=5.5):
+    """
+    Re-encodes a video at `size` with boosted audio, then deletes the input.
+    workers > 1 (or 0 for all cores) renders in parallel segments.
+    """
+    profile = get_profile(profile)
+    clip_args = (input_video_path, profile_size(profile, size), volume, profile)
+    options = write_options(profile, fps=FPS, preset="slow", ffmpeg_params=["-loglevel", "error"])
+    if workers == 1:
+        video = resized_clip(*clip_args)
+        with span("write_videofile"):
+            video.write_videofile(output_video_path, codec=CODEC, **options)
+        video.close()
+    else:
+        with span("render_segmented"):
+            render_segmented(resized_clip, clip_args, output_video_path, codec=CODEC, workers=workers or None,
+                             **options)
+    if os.path.exists(input_video_path):
+        os.remove(input_video_path)
+        print(f"Original video {input_video_path} has been deleted.")
+    else:
+        print(f"Original video {input_video_path} does not exist.")
+
+
+@traced()
+def apply_style(image_path, quote, author, style_type, audio_content=None, output_path="output.png",
+                video_output_path="output_video.mp4", profile=None):
+    """Renders one style and, when audio_content is given, turns it into a video."""
+    if style_type not in STYLES:
+        print(f"Style '{style_type}' not recognized!")
+        return
+    STYLES[style_type](image_path, quote, author, output_path)
+    if audio_content:
+        create_video_with_audio(output_path, audio_content, video_output_path, profile)
@@ -1,13 +1,14 @@
 from manim import *
 from manim import config
-import requests
 import logging
 import os
-from io import BytesIO
-from PIL import Image
 import textwrap
 from pydub import AudioSegment
 
+from quote_media import apis as quote_api
+from quote_media import fetch_cat_image
+from assets import preflight
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -15,73 +16,17 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 cat_api_key = os.environ.get("CAT_API_KEY")
 voice_api_key = os.environ.get("VOICE_RSS_API_KEY")
 
-# Define effect sound file (ensure this file exists)
-cool_effect_file = "subclip.ogg"
+# Effect sound and ffmpeg, resolved at import so a missing one fails before any API call
+ASSETS = preflight(files=["subclip.ogg"], binaries=["ffmpeg"])
+cool_effect_file = ASSETS["subclip.ogg"]
 
 def fetch_quote():
-    """Fetches a random motivational quote from ZenQuotes API."""
-    url = "https://zenquotes.io/api/random"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if isinstance(data, list) and data:
-            return {"quote": data[0].get("q", "No quote found"), 
-                    "author": data[0].get("a", "Unknown")}
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching quote: {e}")
-    return {"quote": "No quote found", "author": "Unknown"}
-
-def fetch_cat_image(api_key, target_width=1280, target_height=720):
-    """
-    Fetches a random cat image from TheCatAPI and saves it locally.
-    """
-    url = "https://api.thecatapi.com/v1/images/search"
-    headers = {"x-api-key": api_key}
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if isinstance(data, list) and data:
-            if "url" in data[0]:
-                image_url = data[0]["url"]
-                response = requests.get(image_url, timeout=10)
-                response.raise_for_status()
-                img = Image.open(BytesIO(response.content))
-                img = img.convert("RGB")
-                img.save("cat_image.jpg")
-                return "cat_image.jpg"
-            else:
-                logging.error("No 'url' key found in the response data.")
-        else:
-            logging.error("API response is not a valid list or is empty.")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching cat image: {e}")
-    return None
+    """Fetches a random motivational quote, with a placeholder when the API fails."""
+    return quote_api.fetch_quote(default={"quote": "No quote found", "author": "Unknown"})
 
 def fetch_voiceover(quote, api_key):
-    """Fetches voiceover for the given quote using VoiceRSS API."""
-    url = "https://api.voicerss.org/"
-    params = {
-        "key": api_key,
-        "hl": "en-us",
-        "src": quote,
-        "r": "0",
-        "c": "mp3",
-        "f": "44khz_16bit_stereo",
-        "b64": "false",
-        "v": "John"
-    }
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        file_path = "voiceover.mp3"
-        with open(file_path, "wb") as f:
-            f.write(response.content)
-        return file_path
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching voiceover: {e}")
-    return None
+    """Fetches voiceover for the given quote using VoiceRSS API and saves it as voiceover.mp3."""
+    return quote_api.fetch_voiceover(quote, api_key, path="voiceover.mp3")
 
 def create_quote_mobjects(quote_text, quote_author, frame_width, frame_height):
     """Creates properly formatted text objects for the quote and author."""
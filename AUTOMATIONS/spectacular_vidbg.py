@@ -1,5 +1,4 @@
 from manim import *
-import requests
 import logging
 import os
 import textwrap
@@ -7,6 +6,9 @@ import subprocess
 import json
 from pydub import AudioSegment
 
+from quote_media import apis as quote_api
+from assets import preflight
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -14,60 +16,27 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 cat_api_key = os.environ.get("CAT_API_KEY")
 voice_api_key = os.environ.get("VOICE_RSS_API_KEY")
 
+# Effect sound, background video and ffmpeg, resolved at import so a missing
+# one fails before any API call
+ASSETS = preflight(files=["subclip.ogg", "219305_tiny.mp4"], binaries=["ffmpeg"])
+
 # Global variables to store fetched data (avoiding redundant calls)
 quote_data = None
 voiceover_file = None
 
 def fetch_quote():
-    """Fetches a random motivational quote from ZenQuotes API."""
+    """Fetches a random motivational quote once per run, with a placeholder when the API fails."""
     global quote_data
-    if quote_data is not None:
-        return quote_data
-
-    url = "https://zenquotes.io/api/random"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        logging.info(f"Fetched data: {data}")
-        if isinstance(data, list) and data:
-            quote_data = {"quote": data[0].get("q", "No quote found"),
-                          "author": data[0].get("a", "Unknown")}
-            return quote_data
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching quote: {e}")
-    
-    quote_data = {"quote": "No quote found", "author": "Unknown"}
+    if quote_data is None:
+        quote_data = quote_api.fetch_quote(default={"quote": "No quote found", "author": "Unknown"})
     return quote_data
 
 def fetch_voiceover(quote, api_key):
     """Fetches voiceover for the given quote using VoiceRSS API (and caches result)."""
     global voiceover_file
-    if voiceover_file is not None and os.path.exists(voiceover_file):
-        return voiceover_file
-
-    url = "https://api.voicerss.org/"
-    params = {
-        "key": api_key,
-        "hl": "en-us",
-        "src": quote,
-        "r": "0",
-        "c": "mp3",
-        "f": "44khz_16bit_stereo",
-        "b64": "false",
-        "v": "John"
-    }
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        file_path = "voiceover.mp3"
-        with open(file_path, "wb") as f:
-            f.write(response.content)
-        voiceover_file = file_path
-        return file_path
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching voiceover: {e}")
-    return None
+    if voiceover_file is None or not os.path.exists(voiceover_file):
+        voiceover_file = quote_api.fetch_voiceover(quote, api_key, path="voiceover.mp3")
+    return voiceover_file
 
 def create_quote_mobjects(quote_text, quote_author, frame_width, frame_height):
     """
@@ -133,7 +102,7 @@ def extract_video_frames(video_file, fps=30):
     os.makedirs(output_dir, exist_ok=True)
     
     frame_pattern = os.path.join(output_dir, "frame%03d.png")
-    command = ["ffmpeg", "-i", video_file, "-vf", f"fps={fps}", frame_pattern]
+    command = [ASSETS["ffmpeg"], "-i", video_file, "-vf", f"fps={fps}", frame_pattern]
     subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     
     frame_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.endswith(".png")]
@@ -145,12 +114,12 @@ class AnimatedQuoteWithBackground(Scene):
         total_duration = 7
 
         # Add looping background sound (trimmed to total_duration)
-        cool_effect_file = "subclip.ogg"
+        cool_effect_file = ASSETS["subclip.ogg"]
         looped_effect = loop_sound(cool_effect_file, total_duration)
         self.add_sound(looped_effect, gain=-5)
 
         # Extract video frames from background video
-        video_background_file = "219305_tiny.mp4"
+        video_background_file = ASSETS["219305_tiny.mp4"]
         video_frames = extract_video_frames(video_background_file, fps=30)
         
         # Instead of animating every frame, select a subset.
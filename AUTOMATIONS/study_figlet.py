@@ -1,12 +1,13 @@
 from manim import *
 from manim import config
-import requests
 import logging
 import pyfiglet
 import os
 import textwrap
 from pydub import AudioSegment
 
+from quote_media import apis as quote_api
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -17,50 +18,15 @@ voiceover_file = None
 voice_api_key = os.environ.get("VOICE_RSS_API_KEY")
 
 def fetch_quote():
-    """Fetches a random motivational quote from ZenQuotes API."""
+    """Fetches a random motivational quote once per run, with a placeholder when the API fails."""
     global quote_data
-    if quote_data is not None:
-        return quote_data
-
-    url = "https://zenquotes.io/api/random"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        logging.info(f"Fetched data: {data}")
-        if isinstance(data, list) and data:
-            quote_data = {"quote": data[0].get("q", "No quote found"),
-                          "author": data[0].get("a", "Unknown")}
-            return quote_data
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching quote: {e}")
-    
-    quote_data = {"quote": "No quote found", "author": "Unknown"}
+    if quote_data is None:
+        quote_data = quote_api.fetch_quote(default={"quote": "No quote found", "author": "Unknown"})
     return quote_data
 
 def fetch_voiceover(quote, api_key):
-    """Fetches voiceover for the given quote using VoiceRSS API."""
-    url = "https://api.voicerss.org/"
-    params = {
-        "key": api_key,
-        "hl": "en-us",
-        "src": quote,
-        "r": "0",
-        "c": "mp3",
-        "f": "44khz_16bit_stereo",
-        "b64": "false",
-        "v": "John"
-    }
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        file_path = "voiceover.mp3"
-        with open(file_path, "wb") as f:
-            f.write(response.content)
-        return file_path
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching voiceover: {e}")
-    return None
+    """Fetches voiceover for the given quote using VoiceRSS API and saves it as voiceover.mp3."""
+    return quote_api.fetch_voiceover(quote, api_key, path="voiceover.mp3")
 
 def get_audio_duration(audio_file):
     """Returns the duration (in seconds) of the given audio file."""
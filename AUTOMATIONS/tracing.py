@@ -0,0 +1,137 @@
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import datetime
+import functools
+import threading
+import contextlib
+
+# Lightweight stage tracing for the AUTOMATIONS scripts.
+# Wrap a stage in `with span("name"):` or decorate a function with @traced();
+# spans nest (their path reads like "apply_style/retro_style"), are timed with
+# a monotonic clock, and the script writes one JSON trace per run with
+# write_trace(). Traces go to $TRACE_DIR (default: traces/).
+#
+# cProfile is opt-in per span: set TRACE_PROFILE to a comma-separated list of
+# span names (or "all"). Profiled spans get a .prof file next to the trace and
+# their top functions in the JSON.
+
+TRACE_DIR = os.environ.get("TRACE_DIR", "traces")
+PROFILE_TOP = 15  # functions listed per profiled span
+
+
+def _profiled_names():
+    return {name.strip() for name in os.environ.get("TRACE_PROFILE", "").split(",") if name.strip()}
+
+
+class Tracer:
+    """Collects spans for one run. Safe to use from several threads."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.origin = time.monotonic()
+        self.spans = []
+        self.profiles = {}
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self.profile_names = _profiled_names()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def span(self, name, profile=None, **attributes):
+        """Times the enclosed block as a span; profile=True forces cProfile on for it."""
+        stack = self._stack()
+        path = "/".join(stack + [name])
+        stack.append(name)
+        if profile is None:
+            profile = "all" in self.profile_names or name in self.profile_names
+        # Only one cProfile can run per thread, so nested profiled spans share the outer one
+        profiler = cProfile.Profile() if profile and not getattr(self._local, "profiling", False) else None
+        record = {"name": name, "path": path, "thread": threading.current_thread().name, **attributes}
+        start = time.monotonic()
+        if profiler is not None:
+            self._local.profiling = True
+            profiler.enable()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = repr(e)
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._local.profiling = False
+            record["start"] = start - self.origin
+            record["duration"] = time.monotonic() - start
+            stack.pop()
+            with self.lock:
+                if profiler is not None:
+                    record["profile_id"] = len(self.profiles)
+                    self.profiles[record["profile_id"]] = profiler
+                self.spans.append(record)
+
+    def traced(self, name=None, profile=None):
+        """Decorator running the function inside a span (named after the function by default)."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name or func.__name__, profile):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """Total seconds and call count per span name."""
+        totals = {}
+        with self.lock:
+            for record in self.spans:
+                entry = totals.setdefault(record["name"], {"calls": 0, "seconds": 0.0})
+                entry["calls"] += 1
+                entry["seconds"] += record["duration"]
+        return totals
+
+    def write(self, trace_dir=None, run_name=None):
+        """Writes the trace (and any .prof files) and returns the JSON path."""
+        trace_dir = trace_dir or TRACE_DIR
+        os.makedirs(trace_dir, exist_ok=True)
+        stamp = datetime.datetime.fromtimestamp(self.started).strftime("%Y%m%d_%H%M%S")
+        run_id = f"{run_name or 'run'}_{stamp}_{os.getpid()}"
+        with self.lock:
+            spans = sorted(self.spans, key=lambda record: record["start"])
+            for record in spans:
+                profiler = self.profiles.get(record.pop("profile_id", None))
+                if profiler is None:
+                    continue
+                prof_path = os.path.join(trace_dir, f"{run_id}_{record['name']}_{record['start']:.3f}.prof")
+                profiler.dump_stats(prof_path)
+                report = io.StringIO()
+                pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP)
+                record["profile"] = {"file": prof_path, "top": report.getvalue()}
+        trace = {
+            "run_id": run_id,
+            "started": datetime.datetime.fromtimestamp(self.started).isoformat(),
+            "seconds": time.monotonic() - self.origin,
+            "spans": spans,
+            "summary": self.summary(),
+        }
+        path = os.path.join(trace_dir, f"{run_id}.json")
+        with open(path, "w", encoding="utf-8") as fl_obj:
+            json.dump(trace, fl_obj, indent=2, default=str)
+        return path
+
+
+# Process-wide tracer used by the scripts
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
+
+
+def write_trace(run_name=None, trace_dir=None):
+    return tracer.write(trace_dir, run_name)
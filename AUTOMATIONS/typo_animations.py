@@ -1,12 +1,9 @@
-from moviepy.config import change_settings
 from moviepy.editor import *
 import logging
 import os
 
-# Set the ImageMagick path for Windows
-change_settings({
-    "IMAGEMAGICK_BINARY": r"C:\Program Files\ImageMagick-7.1.1-Q16-HDRI\magick.exe"
-})
+from assets import preflight, configure_imagemagick
+from video_render import get_profile, write_options, profile_size, apply_volume
 
 # Configure logging
 logging.basicConfig(
@@ -41,7 +38,8 @@ def fade_in_text(text, font_path, font_size, duration, color="white", bg_color=N
         raise
 
 # Function to create a video with animated text
-def animate_text_with_background(cat_image_path, quote, author, output_video, audio_path=None, resolution=(1280, 720), font_path=r"C:\Windows\Fonts\arial.ttf"):
+def animate_text_with_background(cat_image_path, quote, author, output_video, audio_path=None, resolution=(1280, 720), font_path=r"C:\Windows\Fonts\arial.ttf", profile=None):
+    profile = get_profile(profile)
     try:
         # Validate font path
         assert os.path.exists(font_path), f"Font path does not exist: {font_path}"
@@ -52,17 +50,17 @@ def animate_text_with_background(cat_image_path, quote, author, output_video, au
         logging.info(f"Font: {font_path}")
 
         # Background clip
-        bg_clip = ImageClip(cat_image_path).set_duration(5).resize(resolution)
+        bg_clip = ImageClip(cat_image_path).set_duration(5).resize(profile_size(profile, resolution))
         logging.info(f"Background clip type: {type(bg_clip)}")
 
         # Quote animation
         quote_clip = typewriter_effect(
-            quote, font_path=font_path, font_size=50, duration=4, 
+            quote, font_path=font_path, font_size=int(50 * profile.scale), duration=4, 
             color="white", bg_color="black").set_position(("center", "center"))
 
         # Author animation
         author_clip = fade_in_text(
-            author, font_path=font_path, font_size=40, duration=2, 
+            author, font_path=font_path, font_size=int(40 * profile.scale), duration=2, 
             color="yellow", bg_color="black").set_position(("center", "bottom"))
 
         # Dynamically adjust background duration
@@ -86,10 +84,10 @@ def animate_text_with_background(cat_image_path, quote, author, output_video, au
         # Add audio if provided
         if audio_path:
             audio = AudioFileClip(audio_path)
-            final_clip = final_clip.set_audio(audio).volumex(5.5)
+            final_clip = apply_volume(final_clip.set_audio(audio), 5.5, profile)
 
         # Write the final video
-        final_clip.write_videofile(output_video, codec="libx264", fps=24)
+        final_clip.write_videofile(output_video, codec="libx264", **write_options(profile, fps=24))
         logging.info(f"Video created successfully: {output_video}")
 
     except Exception as e:
@@ -103,7 +101,9 @@ if __name__ == "__main__":
     output_video = "animated_quote_video.mp4"
     audio_path = None  
     resolution = (1280, 720)
-    font_path = r"C:\Windows\Fonts\arial.ttf"
+    # Resolves arial.ttf on any platform (Liberation Sans stands in on Linux)
+    font_path = preflight(fonts=["arial.ttf"], files=[cat_image_path], imagemagick=True)["arial.ttf"]
+    configure_imagemagick()
 
     animate_text_with_background(
         cat_image_path, quote, author, output_video, 
@@ -0,0 +1,149 @@
+import os
+import math
+import shutil
+import logging
+import tempfile
+import subprocess
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+# Segmented rendering for long moviepy composites.
+# write_videofile generates every frame in one process, so the composite (not
+# ffmpeg) becomes the bottleneck. Here the timeline is split into chunks that
+# start on keyframe boundaries, each chunk is rendered by its own worker
+# process, and the chunks are joined with ffmpeg's concat demuxer without
+# re-encoding. The audio track is written once and muxed in at the end.
+#
+# Clips can't be sent to other processes, so callers pass a top-level
+# "factory" function (plus picklable arguments) that builds the clip; every
+# worker builds its own copy. Scripts using this must keep their main code
+# under `if __name__ == "__main__":` so workers can import them.
+#
+# Render profiles switch every video writer between quick previews ("draft")
+# and the full-quality output ("publish"). Pick one per run with the
+# RENDER_PROFILE environment variable (default: publish) or a --profile flag.
+#
+# moviepy is only imported inside the functions that encode, so scripts can
+# import the profiles without paying for the media stack on image-only runs.
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    name: str
+    scale: float           # multiplier for the frame size
+    fps: int = None        # None keeps the writer's own fps
+    preset: str = None     # None keeps the writer's own x264 preset
+    normalize_audio: bool = True  # apply the writers' volume boosts
+
+
+RENDER_PROFILES = {
+    "draft": RenderProfile("draft", scale=0.5, fps=12, preset="ultrafast", normalize_audio=False),
+    "publish": RenderProfile("publish", scale=1.0),
+}
+
+
+def get_profile(profile=None):
+    """Returns a RenderProfile from a profile, a profile name, or $RENDER_PROFILE."""
+    if isinstance(profile, RenderProfile):
+        return profile
+    name = profile or os.environ.get("RENDER_PROFILE", "publish")
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile '{name}'; choose from {', '.join(RENDER_PROFILES)}")
+    return RENDER_PROFILES[name]
+
+
+def write_options(profile, fps=24, preset="medium", **options):
+    """write_videofile keyword arguments for the profile, given the writer's own defaults."""
+    return {"fps": profile.fps or fps, "preset": profile.preset or preset, **options}
+
+
+def profile_size(profile, size):
+    """Scales (width, height) for the profile, keeping both even for libx264."""
+    width, height = size
+    return (int(width * profile.scale) // 2 * 2, int(height * profile.scale) // 2 * 2)
+
+
+def apply_volume(clip, volume, profile):
+    """Applies the writer's volume boost unless the profile skips audio normalization."""
+    return clip.volumex(volume) if profile.normalize_audio else clip
+
+
+def segment_bounds(total_frames, workers, keyframe_interval):
+    """
+    Splits frames 0..total_frames into at most `workers` (start, end) ranges
+    whose starts fall on multiples of keyframe_interval.
+    """
+    per_segment = math.ceil(total_frames / max(1, workers))
+    per_segment = max(keyframe_interval, math.ceil(per_segment / keyframe_interval) * keyframe_interval)
+    return [(start, min(start + per_segment, total_frames)) for start in range(0, total_frames, per_segment)]
+
+
+def _render_segment(factory, factory_args, start_frame, end_frame, fps, path, codec, preset, ffmpeg_params):
+    from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+    clip = factory(*factory_args)
+    writer = FFMPEG_VideoWriter(path, clip.size, fps, codec=codec, preset=preset, ffmpeg_params=ffmpeg_params)
+    try:
+        for index in range(start_frame, end_frame):
+            frame = clip.get_frame(index / fps)
+            if frame.dtype != "uint8":
+                frame = frame.astype("uint8")
+            writer.write_frame(frame)
+    finally:
+        writer.close()
+        clip.close()
+    return path
+
+
+def concat_segments(segment_paths, output_path, audio_path=None, list_dir=None):
+    """Joins encoded segments (and an optional audio file) into output_path without re-encoding."""
+    from moviepy.config import get_setting
+
+    list_path = os.path.join(list_dir or os.path.dirname(segment_paths[0]), "segments.txt")
+    with open(list_path, "w", encoding="utf-8") as fl_obj:
+        for path in segment_paths:
+            fl_obj.write(f"file '{os.path.abspath(path)}'\n")
+    command = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_path]
+    if audio_path:
+        command += ["-i", audio_path, "-map", "0:v:0", "-map", "1:a:0"]
+    command += ["-c", "copy", "-movflags", "+faststart", output_path]
+    subprocess.run(command, check=True)
+
+
+def render_segmented(factory, factory_args=(), output_path="output.mp4", fps=24, codec="libx264",
+                     preset="medium", audio_codec="aac", workers=None, keyframe_seconds=2.0,
+                     ffmpeg_params=None):
+    """
+    Renders factory(*factory_args) to output_path using `workers` processes
+    (default: all cores). Output matches a single write_videofile call with the
+    same codec settings, except that keyframes sit every keyframe_seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    keyframe_interval = max(1, round(keyframe_seconds * fps))
+    ffmpeg_params = list(ffmpeg_params or []) + ["-g", str(keyframe_interval)]
+
+    clip = factory(*factory_args)
+    total_frames = int(clip.duration * fps)
+    temp_dir = tempfile.mkdtemp(prefix="segments_")
+    try:
+        audio_path = None
+        if clip.audio is not None:
+            audio_path = os.path.join(temp_dir, "audio.m4a")
+            clip.audio.write_audiofile(audio_path, codec=audio_codec, logger=None)
+        clip.close()
+
+        bounds = segment_bounds(total_frames, workers, keyframe_interval)
+        logging.info(f"Rendering {total_frames} frames as {len(bounds)} segment(s) on {workers} worker(s)")
+        paths = [os.path.join(temp_dir, f"segment_{i:04d}.mp4") for i in range(len(bounds))]
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as executor:
+            futures = [
+                executor.submit(_render_segment, factory, factory_args, start, end, fps, path,
+                                codec, preset, ffmpeg_params)
+                for (start, end), path in zip(bounds, paths)
+            ]
+            for future in futures:
+                future.result()
+        concat_segments(paths, output_path, audio_path, temp_dir)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return output_path
@@ -1,12 +1,9 @@
-# configure image-magick
-from moviepy.config import change_settings
-change_settings({"IMAGEMAGICK_BINARY": r"C:\Program Files\ImageMagick-7.1.1-Q16-HDRI\magick.exe"})
-
 import tempfile
 import requests
-import moviepy.editor as mpy
 import os
 
+from video_render import get_profile, write_options, profile_size
+
 # Fetch a voice cover for a text
 def fetch_voiceover(text, api_key, language='en-us', gender="male"):
     """
@@ -30,24 +27,29 @@ def fetch_voiceover(text, api_key, language='en-us', gender="male"):
 
 
 # Create a video with the voicecove and an image
-def create_video_with_audio(image_path, audio_content, output_video='output_video.mp4'):
+def create_video_with_audio(image_path, audio_content, output_video='output_video.mp4', profile=None):
     """
     Creates a video from an image and audio content.
     """
+    import moviepy.editor as mpy
+
     # Save audio content to a temporary file
     with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_audio_file:
         temp_audio_file.write(audio_content)
         temp_audio_path = temp_audio_file.name
 
     # Load the image and audio
+    profile = get_profile(profile)
     image_clip = mpy.ImageClip(image_path, duration=5)  # Duration of the image display
+    if profile.scale != 1:
+        image_clip = image_clip.resize(newsize=profile_size(profile, image_clip.size))
     audio_clip = mpy.AudioFileClip(temp_audio_path)
 
     # Set the audio to the video clip
     video_clip = image_clip.set_audio(audio_clip)
 
     # Write the video file
-    video_clip.write_videofile(output_video, codec='libx264', fps=24)
+    video_clip.write_videofile(output_video, codec='libx264', **write_options(profile, fps=24))
     print(f"Video created: {output_video}")
 
     # Clean up the temporary audio file
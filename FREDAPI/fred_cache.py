@@ -0,0 +1,127 @@
+from fredapi import Fred
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# On-disk cache in front of the FRED API.
+# Observations are stored per series and per realtime vintage as compact .npz
+# files (day numbers + float values). Refreshing only asks FRED for
+# observations from the cached tail onwards, and many series are fetched
+# concurrently.
+
+LATEST = "latest"
+
+
+class FredCache:
+    """Concurrent, incremental FRED downloader backed by an on-disk cache."""
+
+    def __init__(self, api_key=None, cache_dir="fred_cache", max_age=12 * 3600, max_workers=8):
+        self.fred = Fred(api_key=api_key or os.environ.get("FRED_API_KEY"))
+        self.cache_dir = cache_dir
+        # How long (seconds) "latest" data is trusted before its tail is refreshed.
+        # Past vintages never change, so once cached they are never refetched.
+        self.max_age = max_age
+        self.max_workers = max_workers
+
+    def _path(self, series_id, vintage):
+        return os.path.join(self.cache_dir, series_id, f"{vintage or LATEST}.npz")
+
+    def _read(self, series_id, vintage):
+        path = self._path(series_id, vintage)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as cached:
+            return cached["days"], cached["values"], float(cached["fetched_at"])
+
+    def _write(self, series_id, vintage, days, values):
+        path = self._path(series_id, vintage)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, days=days, values=values, fetched_at=time.time())
+        os.replace(tmp_path, path)
+
+    def _download(self, series_id, vintage, start=None):
+        kwargs = {}
+        if vintage:
+            kwargs = {"realtime_start": vintage, "realtime_end": vintage}
+        series = self.fred.get_series(series_id, observation_start=start, **kwargs)
+        days = series.index.values.astype("datetime64[D]").astype(np.int64)
+        return days, series.to_numpy(dtype=np.float64)
+
+    def get(self, series_id, vintage=None, refresh=False):
+        """
+        Returns (dates, values) for one series as NumPy arrays
+        (datetime64[D] and float64). `vintage` is a YYYY-MM-DD realtime date;
+        None means the latest data.
+        """
+        cached = self._read(series_id, vintage)
+        if cached is not None:
+            days, values, fetched_at = cached
+            fresh = vintage is not None or time.time() - fetched_at < self.max_age
+            if fresh and not refresh:
+                return days.astype("datetime64[D]"), values
+            # Re-request the last cached observation too, so a revision to it is picked up
+            start = str(days[-1].astype("datetime64[D]")) if len(days) else None
+            new_days, new_values = self._download(series_id, vintage, start)
+            keep = days < new_days[0] if len(new_days) else np.ones(len(days), dtype=bool)
+            days = np.concatenate([days[keep], new_days])
+            values = np.concatenate([values[keep], new_values])
+            logging.info(f"{series_id}: {len(new_days)} observation(s) refreshed from {start}")
+        else:
+            days, values = self._download(series_id, vintage)
+            logging.info(f"{series_id}: downloaded {len(days)} observation(s)")
+        self._write(series_id, vintage, days, values)
+        return days.astype("datetime64[D]"), values
+
+    def get_many(self, series_ids, vintage=None, refresh=False):
+        """Fetches several series concurrently; returns {series_id: (dates, values)}."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                series_id: executor.submit(self.get, series_id, vintage, refresh)
+                for series_id in series_ids
+            }
+            for series_id, future in futures.items():
+                try:
+                    results[series_id] = future.result()
+                except Exception as e:
+                    logging.error(f"Error fetching {series_id}: {e}")
+        return results
+
+    def aligned(self, series_ids, vintage=None, refresh=False):
+        """
+        Returns (dates, matrix) where matrix[i, j] is series j on dates[i],
+        NaN where a series has no observation for that date.
+        """
+        data = self.get_many(series_ids, vintage, refresh)
+        dates = np.unique(np.concatenate([d for d, _ in data.values()])) if data else np.array([], "datetime64[D]")
+        matrix = np.full((len(dates), len(series_ids)), np.nan)
+        for j, series_id in enumerate(series_ids):
+            if series_id in data:
+                series_dates, values = data[series_id]
+                matrix[np.searchsorted(dates, series_dates), j] = values
+        return dates, matrix
+
+    def frame(self, series_ids, vintage=None, refresh=False):
+        """Same as aligned(), as a DataFrame with one column per series."""
+        dates, matrix = self.aligned(series_ids, vintage, refresh)
+        return pd.DataFrame(matrix, index=pd.DatetimeIndex(dates, name="date"), columns=list(series_ids))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Download FRED series through the local cache.")
+    parser.add_argument("series", nargs="+", help="FRED series ids, e.g. SP500 GDP UNRATE")
+    parser.add_argument("--vintage", default=None, help="Realtime vintage date (YYYY-MM-DD)")
+    parser.add_argument("--refresh", action="store_true", help="Refresh the tail even if the cache is fresh")
+    parser.add_argument("--cache-dir", default="fred_cache", help="Cache folder")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    cache = FredCache(cache_dir=args.cache_dir)
+    print(cache.frame(args.series, args.vintage, args.refresh).tail())
@@ -1,7 +1,7 @@
 from fredapi import Fred
 import os
 import matplotlib.pyplot as plt
-import pandas as plt
+import pandas as pd
 #%matplotlib inline
 
 
@@ -1,16 +1,14 @@
-# configure image-magick
-from moviepy.config import change_settings
-change_settings({"IMAGEMAGICK_BINARY": r"C:\Program Files\ImageMagick-7.1.1-Q16-HDRI\magick.exe"})
-
-
 import os
+import argparse
 import moviepy.editor as mpy
-from moviepy.video.VideoClip import TextClip
-from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
-from moviepy.audio.io.AudioFileClip import AudioFileClip
-from moviepy.video.VideoClip import ColorClip
 from IPython.display import Video as ipdVideo
 
+# Run from this folder with AUTOMATIONS on the path:
+#   PYTHONPATH=../../../AUTOMATIONS python Logos_video.py
+from srt_captions import parse_srt, captions_from_timings, caption_video
+from assets import resolve_font
+from video_render import RENDER_PROFILES, render_segmented, get_profile, write_options, profile_size, apply_volume
+
 # Video Specifications
 target_width = 1280
 target_height = 720
@@ -21,21 +19,7 @@ vid_path = r"reencoded_video.mp4"
 audio_path = r"Logos.mp3"
 text_path = r"Logos.txt"
 
-# Check if files exist
-if not all([os.path.exists(vid_path), os.path.exists(audio_path), os.path.exists(text_path)]):
-    raise FileNotFoundError("Ensure video, audio, and text files exist in the specified paths.")
-
-# Load the video
-video = mpy.VideoFileClip(vid_path).without_audio()
-
-# Load the audio
-audio = mpy.AudioFileClip(audio_path)
-
-# Read and process text lines
-with open(text_path, "r") as file:
-    lines = [line.strip() for line in file.readlines()]
-
-# Define start times and durations for each line in seconds
+# Timings for Logos.txt, used when no subtitle file is given
 start_times = [
     0, 1, 3, 5, 8, 10, 11, 14, 16, 18, 20, 22, 25, 27, 29, 31,
     33, 35, 38, 40, 43, 45, 47, 48, 51, 52, 56
@@ -45,52 +29,71 @@ durations = [
     2, 1, 3, 1, 4
 ]
 
-# Error handling for mismatch between lines and timings
-if len(lines) != len(durations):
-    raise ValueError("The number of lines, start times, and durations must match.")
-
-# Create and position text clips with fade-in/out effects
-clips = []
-for line, start, duration in zip(lines, start_times, durations):
-    # Dynamic font size adjustment
-    fontsize = 50
-    while True:
-        text_clip = TextClip(str(line), fontsize=fontsize, color='black', 
-        bg_color="white")
-        if text_clip.w <= target_width * 0.9:  # Ensure text fits within 90% of video width
-            break
-        fontsize -= 2  # Decrease font size if too wide
-
-    # Add fade-in/out effects
-    text_clip = (
-        text_clip.set_position("center")
-        .set_start(start)
-        .set_duration(duration)
-        .crossfadein(0.5)
-        .crossfadeout(0.5)
-    )
-    clips.append(text_clip)
-
-# Combine video, overlay, and text clips
-final_video = CompositeVideoClip([video] + clips).set_audio(audio).volumex(2.5)
-
-# Export the final video
-final_video.write_videofile(
-    "logos_final_2.mp4",
-    fps=target_fps,
-    codec="libx264",
-    audio_codec="aac",
-    preset="slow"
-)
-
-# Release resources
-video.close()
-audio.close()
-final_video.close()
-
-# Display the final video
-# ipd.Video("logos_final_2.mp4", width=650, height=350, embed=True)
-
-
-
 
+def build_captioned_video(video_path, audio_path, captions, font_path, fontsize, fit=True, profile=None):
+    """
+    Loads the video and audio and burns in the captions. Every caption is sized
+    to fit 90% of the width from measured font metrics, rasterized once and
+    blended onto the frames while encoding.
+    """
+    profile = get_profile(profile)
+    video = mpy.VideoFileClip(video_path).without_audio()
+    if profile.scale != 1:
+        video = video.resize(newsize=profile_size(profile, video.size))
+    audio = mpy.AudioFileClip(audio_path)
+    final_video = caption_video(video, captions, font_path=font_path, fontsize=int(fontsize * profile.scale),
+                                color="black", bg_color="white", fade=0.5, fit=fit)
+    return apply_volume(final_video.set_audio(audio), 2.5, profile)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Burn captions into a video.")
+    parser.add_argument("--srt", default=None, help="Subtitle file to caption with, e.g. subtitles.srt")
+    parser.add_argument("--video", default=vid_path)
+    parser.add_argument("--audio", default=audio_path)
+    parser.add_argument("--output", default="logos_final_2.mp4")
+    parser.add_argument("--fontsize", type=int, default=50, help="Largest caption font size")
+    parser.add_argument("--font", default="arial.ttf", help="TrueType font file used for the captions")
+    parser.add_argument("--wrap", action="store_true", help="Wrap long captions instead of shrinking them to fit")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Render in segments on this many processes (0 = all cores)")
+    parser.add_argument("--profile", choices=list(RENDER_PROFILES), default=None,
+                        help="Render profile: draft for quick previews, publish for full quality (default: $RENDER_PROFILE or publish)")
+    args = parser.parse_args()
+
+    # Check if files exist
+    caption_source = args.srt or text_path
+    if not all([os.path.exists(args.video), os.path.exists(args.audio), os.path.exists(caption_source)]):
+        raise FileNotFoundError("Ensure video, audio, and caption files exist in the specified paths.")
+
+    # Captions come from the subtitle file, or from Logos.txt plus the timings above
+    if args.srt:
+        captions = parse_srt(args.srt)
+    else:
+        with open(text_path, "r") as file:
+            lines = [line.strip() for line in file.readlines()]
+        captions = captions_from_timings(lines, start_times, durations)
+
+    # Locates the font or fails here; without Arial installed this is Liberation Sans
+    # or Arimo (same metrics), else DejaVu Sans (wider, so captions fit smaller)
+    font_path = resolve_font(args.font)
+    profile = get_profile(args.profile)
+    build_args = (args.video, args.audio, captions, font_path, args.fontsize, not args.wrap, profile)
+    options = write_options(profile, fps=target_fps, preset="slow")
+    if args.workers == 1:
+        final_video = build_captioned_video(*build_args)
+        # Export the final video
+        final_video.write_videofile(
+            args.output,
+            codec="libx264",
+            audio_codec="aac",
+            **options
+        )
+        # Release resources
+        final_video.close()
+    else:
+        render_segmented(build_captioned_video, build_args, args.output, codec="libx264",
+                         workers=args.workers or None, **options)
+
+    # Display the final video
+    # ipd.Video("logos_final_2.mp4", width=650, height=350, embed=True)
@@ -0,0 +1,227 @@
+import re
+import bisect
+import functools
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# SRT-driven captioning.
+# Subtitles are parsed from .srt files, each caption is rasterized once with
+# Pillow into an RGBA layer, and the layers are alpha-blended onto the video
+# frames during the single final encode (no per-caption ImageMagick renders,
+# no stack of TextClips in a CompositeVideoClip).
+
+# Minutes and seconds may overflow (00:00:109,000); they are normalised when parsed
+TIMESTAMP = r"(\d+):(\d+):(\d+)[,.](\d{1,3})"
+CUE_TIMING = re.compile(TIMESTAMP + r"\s*-->\s*" + TIMESTAMP)
+REFERENCE_SIZE = 100  # font size the glyph advance widths are measured at
+
+
+@dataclass
+class Caption:
+    start: float
+    end: float
+    text: str
+
+
+def _seconds(hours, minutes, seconds, millis):
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(millis.ljust(3, "0")) / 1000
+
+
+def parse_srt(path):
+    """Parses an .srt file into Captions sorted by start time; raises ValueError on a block without timings."""
+    with open(path, "r", encoding="utf-8-sig") as fl_obj:
+        blocks = re.split(r"\n\s*\n", fl_obj.read().replace("\r\n", "\n").strip())
+    captions = []
+    for block in blocks:
+        lines = block.strip().split("\n")
+        for i, line in enumerate(lines):
+            match = CUE_TIMING.search(line)
+            if match:
+                text = "\n".join(l.strip() for l in lines[i + 1:] if l.strip())
+                if text:
+                    groups = match.groups()
+                    captions.append(Caption(_seconds(*groups[:4]), _seconds(*groups[4:]), text))
+                break
+        else:
+            raise ValueError(f"No valid cue timing in {path}, block starting {lines[0]!r}")
+    if not captions:
+        raise ValueError(f"No subtitle cues found in {path}; is it really an SRT file?")
+    captions.sort(key=lambda c: c.start)
+    return captions
+
+
+def captions_from_timings(lines, start_times, durations):
+    """Builds Captions from parallel lists of text lines, start times and durations."""
+    if not (len(lines) == len(durations) <= len(start_times)):
+        raise ValueError("The number of lines, start times, and durations must match.")
+    return [Caption(start, start + duration, line) for line, start, duration in zip(lines, start_times, durations)]
+
+
+def format_timestamp(seconds):
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def write_srt(captions, path):
+    """Writes Captions to an .srt file (e.g. to turn hard-coded timings into data)."""
+    with open(path, "w", encoding="utf-8") as fl_obj:
+        for index, caption in enumerate(captions, start=1):
+            fl_obj.write(f"{index}\n{format_timestamp(caption.start)} --> {format_timestamp(caption.end)}\n"
+                         f"{caption.text}\n\n")
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(font_path, fontsize):
+    """
+    Loads a TrueType font, cached per size. A missing font raises instead of
+    falling back to Pillow's bitmap font, which would make font fitting meaningless.
+    """
+    try:
+        return ImageFont.truetype(font_path, size=fontsize)
+    except OSError as e:
+        raise FileNotFoundError(f"Caption font not found: {font_path}") from e
+
+
+class FontMetrics:
+    """
+    Per-character advance widths of a font, measured once at REFERENCE_SIZE.
+    Text width at any size is estimated by scaling, so no render is needed.
+    """
+
+    def __init__(self, font_path):
+        self.font = load_font(font_path, REFERENCE_SIZE)
+        self.advances = {}
+
+    def width(self, text, fontsize):
+        """Estimated pixel width of the widest line of text at fontsize."""
+        widest = 0.0
+        for line in text.split("\n"):
+            total = 0.0
+            for char in line:
+                if char not in self.advances:
+                    self.advances[char] = self.font.getlength(char)
+                total += self.advances[char]
+            widest = max(widest, total)
+        return widest * fontsize / REFERENCE_SIZE
+
+
+@functools.lru_cache(maxsize=None)
+def font_metrics(font_path):
+    return FontMetrics(font_path)
+
+
+def fit_font_size(text, max_width, font_path="arial.ttf", max_size=50, min_size=10, step=2):
+    """
+    Largest font size in max_size, max_size - step, ... (down to min_size) at
+    which text fits in max_width pixels, computed from the cached metrics
+    instead of rendering every candidate size.
+    """
+    estimated = font_metrics(font_path).width(text, REFERENCE_SIZE)
+    ideal = max_width * REFERENCE_SIZE / estimated if estimated else max_size
+    size = max_size if ideal >= max_size else max_size - step * -(-(max_size - ideal) // step)
+    size = max(min_size, int(size))
+    # The estimate ignores kerning and hinting, so confirm with one real measurement
+    while size > min_size and max(load_font(font_path, size).getlength(line)
+                                  for line in text.split("\n")) > max_width:
+        size -= step
+    return max(min_size, size)
+
+
+def wrap_to_width(text, font, max_width, draw):
+    """Wraps text word by word so no line is wider than max_width pixels."""
+    wrapped = []
+    for paragraph in text.split("\n"):
+        current = ""
+        for word in paragraph.split():
+            test_line = f"{current} {word}" if current else word
+            if current and draw.textlength(test_line, font=font) > max_width:
+                wrapped.append(current)
+                current = word
+            else:
+                current = test_line
+        wrapped.append(current)
+    return "\n".join(wrapped)
+
+
+def rasterize_caption(text, font, max_width, color="black", bg_color="white", padding=10):
+    """Renders caption text once into an RGBA image with a background box."""
+    scratch = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    text = wrap_to_width(text, font, max_width - 2 * padding, scratch)
+    left, top, right, bottom = scratch.multiline_textbbox((0, 0), text, font=font, align="center")
+    size = (int(right - left) + 2 * padding, int(bottom - top) + 2 * padding)
+    layer = Image.new("RGBA", size, bg_color or (0, 0, 0, 0))
+    ImageDraw.Draw(layer).multiline_text((padding - left, padding - top), text, font=font,
+                                         fill=color, align="center")
+    return layer
+
+
+class CaptionTrack:
+    """
+    Pre-rendered captions for one video size. apply(frame, t) blends every
+    caption active at time t onto the frame, with linear fade-in/out.
+
+    With fit=True each caption is shrunk (from fontsize, in steps of 2) to fit
+    on one line; otherwise long captions are wrapped at fontsize.
+    """
+
+    def __init__(self, captions, frame_size, font_path="arial.ttf", fontsize=40, color="black",
+                 bg_color="white", position="center", fade=0.5, max_width_ratio=0.9, bottom_margin=40,
+                 fit=False, padding=10):
+        self.captions = sorted(captions, key=lambda c: c.start)
+        self.starts = [c.start for c in self.captions]
+        self.longest = max((c.end - c.start for c in self.captions), default=0)
+        self.fade = fade
+        width, height = frame_size
+        max_width = int(width * max_width_ratio)
+        self.layers = []
+        for caption in self.captions:
+            size = fit_font_size(caption.text, max_width - 2 * padding, font_path, fontsize) if fit else fontsize
+            layer = rasterize_caption(caption.text, load_font(font_path, size), max_width, color, bg_color, padding)
+            rgba = np.asarray(layer, dtype=np.float32) / 255.0
+            alpha = rgba[:, :, 3:4]
+            x = (width - layer.width) // 2
+            y = (height - layer.height) // 2 if position == "center" else height - layer.height - bottom_margin
+            x, y = max(0, x), max(0, y)
+            h, w = min(layer.height, height - y), min(layer.width, width - x)
+            # Store premultiplied colour so blending is one multiply-add per pixel
+            self.layers.append((x, y, (rgba[:h, :w, :3] * alpha[:h, :w] * 255.0), alpha[:h, :w]))
+
+    def active(self, t):
+        """Indices of the captions showing at time t."""
+        i = bisect.bisect_right(self.starts, t) - 1
+        found = []
+        while i >= 0 and self.starts[i] >= t - self.longest:
+            if self.captions[i].end > t:
+                found.append(i)
+            i -= 1
+        return found
+
+    def opacity(self, index, t):
+        caption = self.captions[index]
+        if self.fade <= 0:
+            return 1.0
+        return max(0.0, min(1.0, (t - caption.start) / self.fade, (caption.end - t) / self.fade))
+
+    def apply(self, frame, t):
+        indices = self.active(t)
+        if not indices:
+            return frame
+        frame = frame.copy()
+        for index in reversed(indices):
+            x, y, premultiplied, alpha = self.layers[index]
+            opacity = self.opacity(index, t)
+            h, w = alpha.shape[:2]
+            region = frame[y:y + h, x:x + w].astype(np.float32)
+            frame[y:y + h, x:x + w] = (region * (1.0 - alpha * opacity) + premultiplied * opacity).astype(np.uint8)
+        return frame
+
+
+def caption_video(video, captions, **track_options):
+    """Returns the moviepy clip with captions burned in by a per-frame filter."""
+    track = CaptionTrack(captions, video.size, **track_options)
+    return video.fl(lambda get_frame, t: track.apply(get_frame(t), t))
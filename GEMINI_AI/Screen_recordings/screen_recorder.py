@@ -2,25 +2,338 @@ import mss
 import cv2
 import numpy as np
 import time
+import threading
+import argparse
+import shutil
+import subprocess
+import zlib
+from collections import deque
 
-screen_size = (1920, 1080)
-fourcc = cv2.VideoWriter_fourcc(*"XVID")
-out = cv2.VideoWriter("screen_recording.avi", fourcc, 20.0, screen_size)
-
-sct = mss.mss()
-start_time = time.time()
-duration = 10  # seconds
-print(f"About to start a screen recording...for: {duration} seconds.")
-print(f"Timing for 15 seconds...")
-time.sleep(15)
-print("Screen recording started...")
-
-while time.time() - start_time < duration:
-    # Capture screen
-    screenshot = sct.grab(sct.monitors[1])  # Select primary monitor
-    frame = np.array(screenshot)
-    frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)  # Remove alpha channel
-    out.write(frame)
-
-out.release()
-print("Screen recording ended...")
+# Screen recorder with capture and encoding on separate threads.
+# The capture thread grabs BGRA frames on a fixed schedule and pushes
+# zero-copy views into a bounded ring buffer; the encoder thread converts and
+# writes them, duplicating or dropping frames by timestamp so the output
+# plays back at exactly the declared frame rate.
+# In delta mode, frames whose sampled pixels haven't changed reuse the previous
+# converted frame, which keeps CPU low for mostly static recordings.
+
+
+class FrameRing:
+    """Bounded FIFO of (timestamp, frame) pairs shared by the two threads."""
+
+    def __init__(self, capacity=64):
+        self.frames = deque()
+        self.capacity = capacity
+        self.closed = False
+        self.dropped = 0
+        self._cond = threading.Condition()
+
+    def push(self, timestamp, frame):
+        """Adds a frame; if the encoder has fallen behind, the frame is dropped."""
+        with self._cond:
+            if len(self.frames) >= self.capacity:
+                self.dropped += 1
+                return False
+            self.frames.append((timestamp, frame))
+            self._cond.notify()
+            return True
+
+    def pop(self):
+        """Blocks for the next frame; returns None once closed and empty."""
+        with self._cond:
+            while not self.frames and not self.closed:
+                self._cond.wait()
+            return self.frames.popleft() if self.frames else None
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class MSSSource:
+    """
+    Captures a monitor (or a region of it) with mss and returns BGRA frames
+    as NumPy views. `region` is (left, top, width, height) relative to the
+    monitor's top-left corner.
+    """
+
+    def __init__(self, monitor=1, region=None):
+        self.monitor_index = monitor
+        self.sct = None
+        with mss.mss() as sct:
+            self.monitor = dict(sct.monitors[monitor])
+        if region is not None:
+            left, top, width, height = region
+            if (left < 0 or top < 0 or left + width > self.monitor["width"]
+                    or top + height > self.monitor["height"]):
+                raise ValueError(f"Region {region} is outside monitor {monitor}")
+            self.monitor = {
+                "left": self.monitor["left"] + left,
+                "top": self.monitor["top"] + top,
+                "width": width,
+                "height": height,
+            }
+        self.size = (self.monitor["width"], self.monitor["height"])
+
+    def grab(self):
+        # mss handles are thread-local, so open it on the capture thread
+        if self.sct is None:
+            self.sct = mss.mss()
+        shot = self.sct.grab(self.monitor)
+        # View the raw BGRA bytes in place instead of copying through np.array()
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self):
+        if self.sct is not None:
+            self.sct.close()
+            self.sct = None
+
+
+class SyntheticSource:
+    """
+    Offscreen frame source for testing without a display: a static background
+    with a block that moves once every `change_every` frames.
+    """
+
+    def __init__(self, size=(640, 360), change_every=10):
+        self.size = size
+        self.change_every = change_every
+        self.count = 0
+        width, height = size
+        self.frame = np.full((height, width, 4), 40, dtype=np.uint8)
+
+    def grab(self):
+        if self.count % self.change_every == 0:
+            width, height = self.size
+            step = self.count // self.change_every
+            x = (step * 37) % max(1, width - 32)
+            y = (step * 23) % max(1, height - 32)
+            self.frame = np.full((height, width, 4), 40, dtype=np.uint8)
+            self.frame[y:y + 32, x:x + 32] = (0, 200, 255, 255)
+        self.count += 1
+        return self.frame
+
+    def close(self):
+        pass
+
+
+def frame_signature(frame, sample_step=4):
+    """
+    Cheap change detector: CRC32 of every `sample_step`-th pixel in each
+    direction. Changes that fall entirely between sampled pixels are missed,
+    so keep the step small for text-heavy content.
+    """
+    return zlib.crc32(np.ascontiguousarray(frame[::sample_step, ::sample_step]))
+
+
+class OpenCVWriter:
+    """Writes BGR frames with cv2.VideoWriter."""
+
+    input_format = "bgr"
+
+    def __init__(self, path, fps, size, codec="XVID"):
+        self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, size)
+        if not self.writer.isOpened():
+            raise IOError(f"Could not open video writer for {path}")
+
+    def write(self, frame):
+        self.writer.write(frame)
+
+    def close(self):
+        self.writer.release()
+
+
+def find_ffmpeg():
+    """Returns the ffmpeg binary on PATH, falling back to the one bundled with imageio-ffmpeg."""
+    binary = shutil.which("ffmpeg")
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        raise FileNotFoundError("ffmpeg not found; install it or `pip install imageio-ffmpeg`")
+
+
+class FFmpegWriter:
+    """
+    Streams raw BGRA frames over a pipe to an ffmpeg subprocess encoding
+    libx264. ffmpeg does the colour conversion on its own threads, so the
+    encoder thread skips cv2.cvtColor entirely.
+    """
+
+    input_format = "bgra"
+
+    def __init__(self, path, fps, size, preset="ultrafast", crf=23, threads=0):
+        width, height = size
+        command = [
+            find_ffmpeg(), "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgra", "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            # yuv420p needs even dimensions; pad odd-sized regions by a pixel
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-threads", str(threads),
+            "-pix_fmt", "yuv420p",
+            path,
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise IOError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+WRITERS = {
+    "opencv": OpenCVWriter,
+    "ffmpeg": FFmpegWriter,
+}
+
+
+class ScreenRecorder:
+    """Records a frame source to a writer at a fixed frame rate."""
+
+    def __init__(self, source, writer, fps=20.0, buffer_size=64, delta=False, sample_step=4):
+        self.source = source
+        self.writer = writer
+        self.fps = fps
+        self.ring = FrameRing(buffer_size)
+        self.delta = delta
+        self.sample_step = sample_step
+        self.convert = getattr(writer, "input_format", "bgr") == "bgr"
+        self.stats = {
+            "captured": 0,
+            "written": 0,
+            "duplicated": 0,
+            "unchanged": 0,
+            "dropped_buffer_full": 0,
+            "dropped_late": 0,
+        }
+        self._stop = threading.Event()
+        self._start_time = None
+        self._end_time = None
+
+    def _capture_loop(self):
+        interval = 1.0 / self.fps
+        next_tick = self._start_time
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now < next_tick:
+                    time.sleep(next_tick - now)
+                    continue
+                # Stamp the frame with when the grab started, not when it finished
+                captured_at = time.monotonic()
+                frame = self.source.grab()
+                self.stats["captured"] += 1
+                self.ring.push(captured_at, frame)
+                # Skip ticks we've already missed rather than bursting to catch up;
+                # the encoder fills those slots by duplicating frames
+                next_tick += interval * max(1, int((time.monotonic() - next_tick) / interval) + 1)
+        finally:
+            self.source.close()
+            self.ring.close()
+
+    def _prepare(self, frame):
+        """Converts a BGRA frame to what the writer expects."""
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR) if self.convert else frame
+
+    def _encode_loop(self):
+        written = 0
+        previous = None
+        previous_signature = None
+        while True:
+            item = self.ring.pop()
+            if item is None:
+                break
+            timestamp, frame = item
+            slot = int((timestamp - self._start_time) * self.fps)
+            if slot < written:
+                # Arrived for a slot that's already been filled
+                self.stats["dropped_late"] += 1
+                continue
+            if previous is not None:
+                for _ in range(slot - written):
+                    self.writer.write(previous)
+                    self.stats["duplicated"] += 1
+                    written += 1
+            if self.delta:
+                signature = frame_signature(frame, self.sample_step)
+                if signature == previous_signature:
+                    self.stats["unchanged"] += 1
+                else:
+                    previous = self._prepare(frame)
+                    previous_signature = signature
+            else:
+                previous = self._prepare(frame)
+            self.writer.write(previous)
+            written += 1
+        # Pad the tail so the file's length matches the wall-clock duration
+        if previous is not None and self._end_time is not None:
+            expected = int((self._end_time - self._start_time) * self.fps)
+            for _ in range(expected - written):
+                self.writer.write(previous)
+                self.stats["duplicated"] += 1
+                written += 1
+        self.stats["written"] = written
+
+    def record(self, duration):
+        """Records for `duration` seconds and returns the stats dict."""
+        self._start_time = time.monotonic()
+        self._end_time = None
+        capture = threading.Thread(target=self._capture_loop, name="capture", daemon=True)
+        encode = threading.Thread(target=self._encode_loop, name="encode", daemon=True)
+        capture.start()
+        encode.start()
+        try:
+            self._stop.wait(duration)
+        finally:
+            self._end_time = time.monotonic()
+            self._stop.set()
+            capture.join()
+            encode.join()
+            self.writer.close()
+        self.stats["dropped_buffer_full"] = self.ring.dropped
+        self.stats["duration"] = self._end_time - self._start_time
+        self.stats["capture_fps"] = self.stats["captured"] / self.stats["duration"]
+        return self.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record the screen to a video file.")
+    parser.add_argument("--output", default=None,
+                        help="Output video path (default: screen_recording.avi / .mp4 by backend)")
+    parser.add_argument("--backend", choices=sorted(WRITERS), default="opencv", help="Video writer backend")
+    parser.add_argument("--preset", default="ultrafast", help="libx264 preset for the ffmpeg backend")
+    parser.add_argument("--crf", type=int, default=23, help="libx264 CRF for the ffmpeg backend")
+    parser.add_argument("--duration", type=float, default=10, help="Recording length in seconds")
+    parser.add_argument("--fps", type=float, default=20.0, help="Output frame rate")
+    parser.add_argument("--monitor", type=int, default=1, help="mss monitor index (1 = primary)")
+    parser.add_argument("--region", type=int, nargs=4, metavar=("LEFT", "TOP", "WIDTH", "HEIGHT"),
+                        default=None, help="Only record this region of the monitor")
+    parser.add_argument("--delta", action="store_true", help="Skip re-converting frames that haven't changed")
+    parser.add_argument("--synthetic", action="store_true", help="Record a synthetic source (no display needed)")
+    parser.add_argument("--delay", type=float, default=15, help="Countdown before recording starts")
+    args = parser.parse_args()
+
+    source = SyntheticSource() if args.synthetic else MSSSource(args.monitor, args.region)
+    if args.backend == "ffmpeg":
+        writer = FFmpegWriter(args.output or "screen_recording.mp4", args.fps, source.size,
+                              preset=args.preset, crf=args.crf)
+    else:
+        writer = OpenCVWriter(args.output or "screen_recording.avi", args.fps, source.size)
+    recorder = ScreenRecorder(source, writer, fps=args.fps, delta=args.delta)
+
+    print(f"About to start a screen recording...for: {args.duration} seconds.")
+    print(f"Timing for {args.delay:g} seconds...")
+    time.sleep(args.delay)
+    print("Screen recording started...")
+    stats = recorder.record(args.duration)
+    print("Screen recording ended...")
+    print(f"Captured {stats['captured']} frames ({stats['capture_fps']:.1f} fps), wrote {stats['written']}, "
+          f"duplicated {stats['duplicated']}, unchanged {stats['unchanged']}, dropped {stats['dropped_buffer_full']} (buffer full) "
+          f"+ {stats['dropped_late']} (late)")
@@ -1,6 +1,11 @@
 import os
 import google.generativeai as genai
-import IPython.display as ipd
+
+# Run from the repository root with GEMINI_AI on the path:
+#   PYTHONPATH=GEMINI_AI python GEMINI_AI/Videos/PixabayVids/test_gemini.py
+from gemini_uploads import cached_upload
+from gemini_cache import ResponseCache, cache_bypassed, cached_generate
+from gemini_stream import stream_to_file
 
 # configure gemini
 api_key = os.environ.get("GOOGLE_API_KEY")
@@ -10,13 +15,14 @@ genai.configure(api_key=api_key)
 model = genai.GenerativeModel("gemini-1.5-flash")
 
 # Upload file
-file_path = ipd.Image(r"GEMINI_AI/schl_logo.jpeg")
+file_path = r"GEMINI_AI/schl_logo.jpeg"
 
 def upload():
     """Än attempt to upload a file"""
     print("Uploading file...")
     try:
-        file = genai.upload_file(file_path)
+        # Reuses the remote copy when the same content was uploaded recently
+        file = cached_upload(file_path)
         print(f"Uploaded file: {file.name}")
         print("File uploaded sucessfully...")
     except:
@@ -25,25 +31,32 @@ def upload():
          return file
 
 # Save generated contents
-def response_in_text(path):
-    """Än attempt to save a file with response from model"""
+def response_in_text(path, prompt, attachments=()):
+    """Streams the model's response into a file as it arrives (reusing a cached answer if there is one)"""
     print(f"Saving file to: {path}")
     try:
-      with open(path, "w", encoding="utf-8") as fl_obj:
-          fl_obj.write(response.text)
-          print("File saved sucessfully...")
-    except:
-        pass
+        metrics = stream_to_file(model, prompt, path, attachments, cache=ResponseCache(),
+                                 bypass=cache_bypassed(), echo=True)
+    except Exception as e:
+        print(f"Failed to save response: {e}")
+        return None
+    if metrics["cached"]:
+        print("File saved sucessfully (from cache)...")
+    else:
+        print(f"File saved sucessfully... first token after {metrics['time_to_first_token']:.2f}s, "
+              f"{metrics['tokens']} tokens in {metrics['seconds']:.1f}s "
+              f"({metrics['tokens_per_second'] or 0:.1f} tokens/s)")
+    return metrics
    
     
 # Define prompt--> text. image, video, audio
-file = upload()
-
+# The logo is only uploaded when there's no cached answer;
+# set GEMINI_NO_CACHE=1 to force a new call
 prompt2 = "How do I design a logo like this using python?"
-response = model.generate_content([file, "\n\n", prompt2])
+response_text = cached_generate(model, ["\n\n", prompt2], attachments=[file_path])
 
 
 # Call method to save the response
-# response_in_text("why_python.txt")
-print(response.text) # print output as text
+# response_in_text("why_python.txt", ["\n\n", prompt2], [file_path])
+print(response_text) # print output as text
 
@@ -0,0 +1,150 @@
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import google.generativeai as genai
+from google.api_core import exceptions as api_exceptions
+
+from gemini_cache import ResponseCache
+from gemini_stream import stream_to_file
+
+# Runs many Gemini prompts concurrently instead of one script run per prompt.
+# Prompts come from a .txt file (one per line) or a .jsonl file of
+# {"prompt": ..., "files": [...], "output": ...} objects. Each answer is
+# streamed into its own output file as chunks arrive.
+
+RETRYABLE_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.InternalServerError,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.TooManyRequests,
+)
+
+
+def configure(api_key=None, endpoint=None):
+    """
+    Configures the SDK. `endpoint` (e.g. http://localhost:8089) points it at a
+    stub server such as gemini_stub_server.py instead of the real API.
+    """
+    if endpoint:
+        genai.configure(api_key=api_key or "stub", transport="rest",
+                        client_options={"api_endpoint": endpoint})
+    else:
+        genai.configure(api_key=api_key or os.environ.get("GOOGLE_API_KEY"))
+
+
+class RateLimiter:
+    """Thread-safe limiter allowing at most `rate` calls per `per` seconds, evenly spaced."""
+
+    def __init__(self, rate, per=60.0):
+        self.interval = per / rate if rate else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def slugify(text, max_length=50):
+    """Turns a prompt into a file-name-safe stem."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")
+    return slug[:max_length] or "response"
+
+
+def load_prompts(path):
+    """
+    Reads prompt jobs from a .txt (one prompt per line) or .jsonl file.
+    Default output names start with the job number, so prompts that share
+    their first 50 characters don't write to the same file.
+    """
+    jobs = []
+    with open(path, "r", encoding="utf-8") as fl_obj:
+        for line in fl_obj:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                job = json.loads(line)
+            else:
+                job = {"prompt": line}
+            job.setdefault("files", [])
+            job.setdefault("output", f"{len(jobs) + 1:03d}_{slugify(job['prompt'])}.txt")
+            jobs.append(job)
+    return jobs
+
+
+def run_prompt(model, job, out_dir, limiter, retries=3, generation_config=None, cache=None):
+    """
+    Runs one prompt job, streaming the answer into its output file.
+    Retries with exponential backoff on rate-limit and transient server errors.
+    With a ResponseCache, a cached answer is written out without calling the model.
+    Returns a result dict with the output path, attempts, timing metrics and any error.
+    """
+    path = os.path.join(out_dir, job["output"])
+    result = {"prompt": job["prompt"], "output": path, "attempts": 0, "error": None, "cached": False}
+    start = time.monotonic()
+    for attempt in range(1, retries + 1):
+        result["attempts"] = attempt
+        try:
+            # stream_to_file starts from an empty file, so retries don't duplicate text
+            result.update(stream_to_file(model, job["prompt"], path, job["files"], generation_config,
+                                         cache, limiter=limiter))
+            break
+        except RETRYABLE_ERRORS as e:
+            if attempt == retries:
+                result["error"] = str(e)
+            else:
+                time.sleep(2 ** (attempt - 1))
+        except Exception as e:
+            result["error"] = str(e)
+            break
+    result["seconds"] = time.monotonic() - start
+    return result
+
+
+def run_batch(jobs, model_name="gemini-1.5-flash", out_dir="responses", concurrency=4,
+              rate=15, retries=3, generation_config=None, cache=None):
+    """
+    Runs every job with up to `concurrency` requests in flight and at most
+    `rate` requests per minute. Returns the per-job results in input order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    model = genai.GenerativeModel(model_name)
+    limiter = RateLimiter(rate)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(run_prompt, model, job, out_dir, limiter, retries, generation_config, cache)
+            for job in jobs
+        ]
+        return [future.result() for future in futures]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a batch of Gemini prompts concurrently.")
+    parser.add_argument("prompts", help="Prompt file (.txt: one prompt per line, or .jsonl)")
+    parser.add_argument("--model", default="gemini-1.5-flash")
+    parser.add_argument("--out-dir", default="responses", help="Folder for the response files")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--rate", type=float, default=15, help="Maximum requests per minute")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--endpoint", default=None, help="API endpoint override, e.g. a local stub server")
+    parser.add_argument("--cache", action="store_true", help="Reuse cached answers for identical prompts")
+    args = parser.parse_args()
+
+    configure(endpoint=args.endpoint)
+    results = run_batch(load_prompts(args.prompts), args.model, args.out_dir,
+                        args.concurrency, args.rate, args.retries,
+                        cache=ResponseCache() if args.cache else None)
+    for result in results:
+        status = f"failed: {result['error']}" if result["error"] else ("cached" if result["cached"] else "saved")
+        print(f"{result['output']} ({result['seconds']:.1f}s, {result['attempts']} attempt(s)) {status}")
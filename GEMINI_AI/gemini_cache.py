@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from gemini_uploads import cached_upload, content_hash
+
+# Opt-in on-disk cache of Gemini answers.
+# Entries are keyed on (model, prompt, attachment contents, generation config),
+# so re-running a script with the same inputs reuses the saved answer instead
+# of paying for another generation. Set GEMINI_NO_CACHE=1 (or pass
+# bypass=True) to force a fresh call; the fresh answer still refreshes the cache.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gemini_cache")
+
+
+class ResponseCache:
+    """Stores answers as JSON files and evicts least-recently-used ones past the limits."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=500, max_bytes=50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(model_name, prompt, attachments=(), generation_config=None):
+        """
+        Builds the cache key; attachments are hashed by content, not by path.
+        Hashes are memoised by path, size and mtime, so a lookup doesn't re-read large files.
+        """
+        payload = {
+            "model": model_name,
+            "prompt": prompt,
+            "attachments": [content_hash(path) for path in attachments],
+            "generation_config": generation_config or {},
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Returns the cached text for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fl_obj:
+                entry = json.load(fl_obj)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        return entry["text"]
+
+    def put(self, key, text, **meta):
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fl_obj:
+            json.dump({"text": text, "created": time.time(), **meta}, fl_obj)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Removes least-recently-used entries until both limits are met."""
+        with self.lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    entries.append((stat.st_mtime, stat.st_size, name))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+                _, size, name = entries.pop(0)
+                os.remove(os.path.join(self.cache_dir, name))
+                total -= size
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+def cache_bypassed():
+    """True when GEMINI_NO_CACHE is set to something truthy."""
+    return os.environ.get("GEMINI_NO_CACHE", "").lower() in ("1", "true", "yes")
+
+
+def cached_generate(model, prompt, attachments=(), generation_config=None, cache=None, bypass=None):
+    """
+    Returns the model's answer text for prompt (plus attachment file paths),
+    from the cache when possible. Attachments are only uploaded on a miss.
+    """
+    cache = cache or ResponseCache()
+    bypass = cache_bypassed() if bypass is None else bypass
+    key = cache.key(model.model_name, prompt, attachments, generation_config)
+    if not bypass:
+        text = cache.get(key)
+        if text is not None:
+            logging.info("Using cached response")
+            return text
+    files = [cached_upload(path) for path in attachments]
+    # A list prompt is sent as separate parts after the files, not as one nested part
+    contents = files + (list(prompt) if isinstance(prompt, (list, tuple)) else [prompt]) if files else prompt
+    response = model.generate_content(contents, generation_config=generation_config)
+    cache.put(key, response.text, model=model.model_name, prompt=prompt)
+    return response.text
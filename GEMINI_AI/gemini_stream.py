@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+
+from gemini_uploads import cached_upload
+
+# Streams a Gemini answer straight into a file as chunks arrive, instead of
+# waiting for the full response and writing response.text in one go.
+# Only the current chunk is held in memory; the file is fsync'd at the end.
+
+
+def _token_count(chunk, words):
+    usage = getattr(chunk, "usage_metadata", None)
+    count = getattr(usage, "candidates_token_count", 0) if usage is not None else 0
+    # Fall back to a word count when the API doesn't report usage
+    return count or words
+
+
+def stream_to_file(model, prompt, path, attachments=(), generation_config=None, cache=None,
+                   echo=False, limiter=None, bypass=False):
+    """
+    Generates an answer for prompt (plus attachment file paths) and appends
+    each streamed chunk to path. With a ResponseCache, a cached answer is
+    written without calling the model (unless bypass=True) and fresh answers
+    are cached.
+    With echo=True chunks are also printed as they arrive. A rate limiter
+    (anything with acquire()) is only consulted when the model is called.
+
+    Returns metrics: time to first token, total seconds, tokens and tokens/second,
+    all measured from the model call itself. Time spent uploading attachments
+    and waiting on the limiter is reported separately (upload_seconds,
+    wait_seconds). Errors are raised, not swallowed; a partial file is left for inspection.
+    """
+    lookup_start = time.monotonic()
+    key = None
+    if cache is not None:
+        key = cache.key(model.model_name, prompt, attachments, generation_config)
+        text = None if bypass else cache.get(key)
+        if text is not None:
+            with open(path, "w", encoding="utf-8") as fl_obj:
+                fl_obj.write(text)
+            if echo:
+                print(text)
+            return {"cached": True, "time_to_first_token": 0.0, "seconds": time.monotonic() - lookup_start,
+                    "tokens": len(text.split()), "tokens_per_second": None,
+                    "upload_seconds": 0.0, "wait_seconds": 0.0}
+
+    upload_start = time.monotonic()
+    files = [cached_upload(p) for p in attachments]
+    upload_seconds = time.monotonic() - upload_start
+    # A list prompt is sent as separate parts after the files, not as one nested part
+    contents = files + (list(prompt) if isinstance(prompt, (list, tuple)) else [prompt]) if files else prompt
+    wait_start = time.monotonic()
+    if limiter is not None:
+        limiter.acquire()
+    wait_seconds = time.monotonic() - wait_start
+    first_token_at = None
+    words = 0
+    last_chunk = None
+    with open(path, "w", encoding="utf-8") as fl_obj:
+        start = time.monotonic()
+        for chunk in model.generate_content(contents, stream=True, generation_config=generation_config):
+            text = chunk.text
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+            fl_obj.write(text)
+            fl_obj.flush()
+            if echo:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            words += len(text.split())
+            last_chunk = chunk
+        fl_obj.flush()
+        os.fsync(fl_obj.fileno())
+    end = time.monotonic()
+    if echo:
+        print()
+
+    tokens = _token_count(last_chunk, words) if last_chunk is not None else 0
+    generating = end - first_token_at if first_token_at is not None else 0.0
+    metrics = {
+        "cached": False,
+        "time_to_first_token": (first_token_at - start) if first_token_at is not None else None,
+        "seconds": end - start,
+        "tokens": tokens,
+        "tokens_per_second": tokens / generating if generating > 0 else None,
+        "upload_seconds": upload_seconds,
+        "wait_seconds": wait_seconds,
+    }
+    if cache is not None:
+        with open(path, "r", encoding="utf-8") as fl_obj:
+            cache.put(key, fl_obj.read(), model=model.model_name, prompt=prompt)
+    return metrics
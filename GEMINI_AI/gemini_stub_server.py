@@ -0,0 +1,98 @@
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the Gemini REST API, for running the batch tools offline.
+# Answers generateContent / streamGenerateContent by echoing the prompt back
+# word by word, with a configurable delay per chunk and optional 429s.
+# Point the SDK at it with:
+#   genai.configure(api_key="stub", transport="rest",
+#                   client_options={"api_endpoint": "http://localhost:8089"})
+
+
+def _chunk(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}]}
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _prompt_text(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        parts = [part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])]
+        return " ".join(p for p in parts if p).strip()
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        prompt = self._prompt_text()
+        with server.lock:
+            server.requests += 1
+            failing = server.fail_every and server.requests % server.fail_every == 0
+        if failing:
+            self._send(429, {"error": {"code": 429, "message": "Resource exhausted (stub)", "status": "RESOURCE_EXHAUSTED"}})
+            return
+        words = f"Echo: {prompt}".split(" ")
+        if ":streamGenerateContent" in self.path:
+            # The REST transport reads a streamed JSON array of responses
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            pieces = ["["] + [
+                ("," if i else "") + json.dumps(_chunk(word + (" " if i < len(words) - 1 else "")))
+                for i, word in enumerate(words)
+            ] + ["]"]
+            for piece in pieces:
+                data = piece.encode("utf-8")
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+                time.sleep(server.chunk_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        elif ":generateContent" in self.path:
+            time.sleep(server.chunk_delay * len(words))
+            self._send(200, _chunk(" ".join(words)))
+        else:
+            self._send(404, {"error": {"code": 404, "message": f"Not handled by stub: {self.path}", "status": "NOT_FOUND"}})
+
+
+def make_stub_server(port=8089, chunk_delay=0.01, fail_every=0):
+    """Creates the stub server without starting it."""
+    server = ThreadingHTTPServer(("localhost", port), StubGeminiHandler)
+    server.chunk_delay = chunk_delay
+    server.fail_every = fail_every
+    server.requests = 0
+    server.lock = threading.Lock()
+    return server
+
+
+def start_stub_server(port=8089, chunk_delay=0.01, fail_every=0):
+    """Starts the stub in a background thread and returns the server (call .shutdown() to stop)."""
+    server = make_stub_server(port, chunk_delay, fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stub of the Gemini REST API.")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="Seconds between streamed chunks")
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with a 429")
+    args = parser.parse_args()
+
+    server = make_stub_server(args.port, args.chunk_delay, args.fail_every)
+    print(f"Stub Gemini API listening on http://localhost:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import datetime
+
+import google.generativeai as genai
+from google.api_core import exceptions as api_exceptions
+
+# Content-hash keyed registry of files uploaded with genai.upload_file.
+# Uploaded files live on Google's side for 48 hours, so re-running a prompt
+# over the same image/video/PDF can reuse the remote file instead of sending
+# the bytes again.
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gemini_uploads.json")
+FILE_TTL = 48 * 3600  # used when the API doesn't report an expiration time
+EXPIRY_MARGIN = 3600  # don't hand out files that expire within the hour
+
+_lock = threading.Lock()  # guards the registry file and _upload_locks
+_upload_locks = {}  # content hash -> lock, so the same file is only uploaded once at a time
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hashes a file in chunks so large videos don't have to fit in memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fl_obj:
+        for chunk in iter(lambda: fl_obj.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_registry(registry_path):
+    if not os.path.exists(registry_path):
+        return {"files": {}, "hashes": {}}
+    with open(registry_path, "r", encoding="utf-8") as fl_obj:
+        return json.load(fl_obj)
+
+
+def _save_registry(registry, registry_path):
+    tmp_path = registry_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fl_obj:
+        json.dump(registry, fl_obj, indent=2)
+    os.replace(tmp_path, registry_path)
+
+
+def content_hash(path, registry_path=REGISTRY_PATH):
+    """SHA-256 of a file, re-hashed only when its size or mtime changed since it was last seen."""
+    # Hashing happens outside the lock so large files don't hold up other threads
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    with _lock:
+        known = _load_registry(registry_path)["hashes"].get(key)
+    if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+        return known["sha256"]
+    sha256 = file_sha256(path)
+    with _lock:
+        registry = _load_registry(registry_path)
+        registry["hashes"][key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha256}
+        _save_registry(registry, registry_path)
+    return sha256
+
+
+def _upload_lock(sha256):
+    with _lock:
+        return _upload_locks.setdefault(sha256, threading.Lock())
+
+
+def _expires_at(file):
+    expiration = getattr(file, "expiration_time", None)
+    if isinstance(expiration, datetime.datetime):
+        return expiration.timestamp()
+    return time.time() + FILE_TTL
+
+
+def cached_upload(path, registry_path=REGISTRY_PATH, mime_type=None):
+    """
+    Returns a file handle for `path`, uploading it only if no unexpired upload
+    of the same content is registered. Falls back to a fresh upload when the
+    registered remote file has been deleted.
+    The registry lock is only held while reading or writing the registry, so
+    different files upload concurrently; the same content uploads once.
+    """
+    sha256 = content_hash(path, registry_path)
+    with _upload_lock(sha256):
+        with _lock:
+            entry = _load_registry(registry_path)["files"].get(sha256)
+        if entry and entry["expires_at"] - EXPIRY_MARGIN > time.time():
+            try:
+                file = genai.get_file(entry["name"])
+                logging.info(f"Reusing uploaded file {entry['name']} for {path}")
+                return file
+            except api_exceptions.NotFound:
+                logging.info(f"Uploaded file {entry['name']} is gone; uploading {path} again")
+
+        logging.info(f"Uploading file {path}...")
+        file = genai.upload_file(path, mime_type=mime_type)
+        with _lock:
+            registry = _load_registry(registry_path)
+            registry["files"][sha256] = {
+                "name": file.name,
+                "uri": getattr(file, "uri", None),
+                "mime_type": getattr(file, "mime_type", mime_type),
+                "path": os.path.abspath(path),
+                "expires_at": _expires_at(file),
+            }
+            # Forget expired uploads so the registry doesn't grow forever
+            now = time.time()
+            registry["files"] = {k: v for k, v in registry["files"].items() if v["expires_at"] > now}
+            _save_registry(registry, registry_path)
+        return file
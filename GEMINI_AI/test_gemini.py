@@ -1,6 +1,8 @@
 import os
 import google.generativeai as genai
-import IPython.display as ipd
+from gemini_uploads import cached_upload
+from gemini_cache import ResponseCache, cache_bypassed
+from gemini_stream import stream_to_file
 
 # configure gemini
 api_key = os.environ.get("GOOGLE_API_KEY")
@@ -10,13 +12,14 @@ genai.configure(api_key=api_key)
 model = genai.GenerativeModel("gemini-1.5-flash")
 
 # Upload file
-file_path = ipd.Image(r"GEMINI_AI/schl_logo.jpeg")
+file_path = r"GEMINI_AI/schl_logo.jpeg"
 
 def upload():
     """Än attempt to upload a file"""
     print("Uploading file...")
     try:
-        file = genai.upload_file(file_path)
+        # Reuses the remote copy when the same content was uploaded recently
+        file = cached_upload(file_path)
         print(f"Uploaded file: {file.name}")
         print("File uploaded sucessfully...")
     except:
@@ -25,24 +28,30 @@ def upload():
          return file
 
 # Save generated contents
-def response_in_text(path):
-    """Än attempt to save a file with response from model"""
+def response_in_text(path, prompt, attachments=()):
+    """Streams the model's response into a file as it arrives (reusing a cached answer if there is one)"""
     print(f"Saving file to: {path}")
     try:
-      with open(path, "w", encoding="utf-8") as fl_obj:
-          fl_obj.write(response.text)
-          print("File saved sucessfully...")
-    except:
-        pass
+        metrics = stream_to_file(model, prompt, path, attachments, cache=ResponseCache(),
+                                 bypass=cache_bypassed(), echo=True)
+    except Exception as e:
+        print(f"Failed to save response: {e}")
+        return None
+    if metrics["cached"]:
+        print("File saved sucessfully (from cache)...")
+    else:
+        print(f"File saved sucessfully... first token after {metrics['time_to_first_token']:.2f}s, "
+              f"{metrics['tokens']} tokens in {metrics['seconds']:.1f}s "
+              f"({metrics['tokens_per_second'] or 0:.1f} tokens/s)")
+    return metrics
    
     
 # Define prompt--> text. image, video, audio
 # file = upload()
 
 prompt2 = "What are some of the characteristics of a programmer programming?"
-response = model.generate_content(prompt2)
 
-# Call method to save the response
-response_in_text("Programmer_xtics.txt")
-print(response.text) # print output as text
+# Call method to stream the response into the file (and print it as it arrives).
+# Reuses the saved answer for an identical prompt; set GEMINI_NO_CACHE=1 to force a new call
+response_in_text("Programmer_xtics.txt", prompt2)
 
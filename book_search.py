@@ -0,0 +1,186 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+
+# Federated book search: queries Open Library and Google Books at the same time
+# and merges what comes back, so a lookup only waits as long as it has to.
+
+OPEN_LIBRARY_URL = "http://openlibrary.org/search.json"
+GOOGLE_BOOKS_URL = "https://www.googleapis.com/books/v1/volumes"
+
+# Fields a merged record needs before we stop waiting for slower backends
+COMPLETE_FIELDS = ("title", "authors", "isbn", "open_library_key", "web_reader_link")
+
+
+def isbn_to_13(isbn):
+    """Normalise an ISBN-10 or ISBN-13 string to ISBN-13 (None if it isn't one)."""
+    digits = "".join(ch for ch in str(isbn) if ch.isdigit() or ch in "xX").upper()
+    if len(digits) == 13 and digits.isdigit():
+        return digits
+    if len(digits) == 10 and digits[:9].isdigit():
+        core = "978" + digits[:9]
+        total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(core))
+        return core + str((10 - total % 10) % 10)
+    return None
+
+
+def _empty_record(source):
+    return {
+        "title": None,
+        "authors": [],
+        "isbn": [],
+        "open_library_key": None,
+        "web_reader_link": None,
+        "sources": [source],
+    }
+
+
+def search_open_library(title, limit=5, timeout=10):
+    """Searches Open Library by title and returns normalised book records."""
+    params = {
+        "title": title,
+        "limit": limit,
+        "fields": "title,author_name,key,isbn",
+    }
+    response = requests.get(OPEN_LIBRARY_URL, params=params, timeout=timeout)
+    response.raise_for_status()
+    books = []
+    for doc in response.json().get("docs", []):
+        record = _empty_record("open_library")
+        record["title"] = doc.get("title")
+        record["authors"] = list(doc.get("author_name", []))
+        record["open_library_key"] = doc.get("key")
+        record["isbn"] = sorted({i for i in map(isbn_to_13, doc.get("isbn", [])) if i})
+        books.append(record)
+    return books
+
+
+def search_google_books(title, limit=5, timeout=10):
+    """Searches Google Books by title and returns normalised book records."""
+    params = {"q": f"intitle:{title}", "maxResults": limit}
+    response = requests.get(GOOGLE_BOOKS_URL, params=params, timeout=timeout)
+    response.raise_for_status()
+    books = []
+    for item in response.json().get("items", []):
+        book_info = item.get("volumeInfo", {})
+        record = _empty_record("google_books")
+        record["title"] = book_info.get("title")
+        record["authors"] = list(book_info.get("authors", []))
+        record["web_reader_link"] = item.get("accessInfo", {}).get("webReaderLink")
+        identifiers = book_info.get("industryIdentifiers", [])
+        record["isbn"] = sorted({
+            i for i in (isbn_to_13(x.get("identifier", "")) for x in identifiers
+                        if x.get("type", "").startswith("ISBN")) if i
+        })
+        books.append(record)
+    return books
+
+
+BACKENDS = {
+    "open_library": search_open_library,
+    "google_books": search_google_books,
+}
+
+
+def merge_results(records):
+    """
+    Merges book records from several backends, treating records that share
+    any ISBN as the same book. Records without an ISBN are kept as they are.
+    """
+    merged = []
+    by_isbn = {}
+    for record in records:
+        match = next((by_isbn[i] for i in record["isbn"] if i in by_isbn), None)
+        if match is None:
+            match = {**record, "authors": list(record["authors"]),
+                     "isbn": list(record["isbn"]), "sources": list(record["sources"])}
+            merged.append(match)
+        else:
+            for field in ("title", "open_library_key", "web_reader_link"):
+                if not match[field]:
+                    match[field] = record[field]
+            if not match["authors"]:
+                match["authors"] = list(record["authors"])
+            match["isbn"] = sorted(set(match["isbn"]) | set(record["isbn"]))
+            match["sources"] += [s for s in record["sources"] if s not in match["sources"]]
+        for isbn in match["isbn"]:
+            by_isbn[isbn] = match
+    # Books confirmed by more backends and with more fields filled in come first
+    merged.sort(key=lambda r: (len(r["sources"]), sum(bool(r[f]) for f in COMPLETE_FIELDS)),
+                reverse=True)
+    return merged
+
+
+def is_complete(record):
+    """True when every field in COMPLETE_FIELDS has a value."""
+    return all(record.get(field) for field in COMPLETE_FIELDS)
+
+
+def search_books(title, deadline=3.0, limit=5, backends=None):
+    """
+    Queries every backend concurrently and returns as soon as the best merged
+    record is complete, every backend has answered, or the deadline (seconds)
+    passes, whichever comes first.
+
+    Returns a dict with the merged "results" and per-backend "latency" in
+    seconds (None for backends that missed the deadline), plus an
+    "errors" dict for backends that raised.
+    """
+    backends = backends or BACKENDS
+    start = time.monotonic()
+    latency = {name: None for name in backends}
+    errors = {}
+    records = []
+    merged = []
+
+    executor = ThreadPoolExecutor(max_workers=len(backends))
+    futures = {executor.submit(fetch, title, limit, deadline): name
+               for name, fetch in backends.items()}
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = deadline - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                latency[name] = time.monotonic() - start
+                try:
+                    records.extend(future.result())
+                except Exception as e:
+                    # Network failures and malformed responses alike: one bad
+                    # backend shouldn't sink the others
+                    logging.error(f"Error querying {name}: {e}")
+                    errors[name] = str(e)
+            merged = merge_results(records)
+            if merged and is_complete(merged[0]):
+                break
+    finally:
+        # Don't block on stragglers; their results are simply dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in pending:
+        logging.warning(f"{futures[future]} did not answer in time; its results were dropped")
+    return {"results": merged, "latency": latency, "errors": errors}
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    query = " ".join(sys.argv[1:]) or "The Prophet"
+    outcome = search_books(query)
+    for name, seconds in outcome["latency"].items():
+        print(f"{name}: {'timed out/failed' if seconds is None else f'{seconds:.2f}s'}")
+    if outcome["results"]:
+        book = outcome["results"][0]
+        print(f"Title: {book['title']}")
+        print(f"Authors: {', '.join(book['authors'])}")
+        print(f"ISBN: {', '.join(book['isbn'][:3])}")
+        print(f"Open Library Key: {book['open_library_key']}")
+        print(f"Web Reader Link: {book['web_reader_link']}")
+    else:
+        print(f"No results found for {query}")